@@ -1,5 +1,6 @@
 from sys import argv
 from data_importer import import_final
+from latest_index import LatestIndex
 
 if __name__ == "__main__":
     # Get the name of the file to target.
@@ -30,7 +31,8 @@ if __name__ == "__main__":
             parts = line.split(':')
             binder[parts[0].strip()] = parts[1].strip()
 
-    # Import the dataset.
+    # Import the dataset from the latest values index.
+    index = LatestIndex()
     head = append_name[:-5]
     width = len(head)
     column = [head]
@@ -40,8 +42,12 @@ if __name__ == "__main__":
         # If a binding is defined, use it.
         if countryName in binder:
             countryName = binder[countryName]
-        # Now import the data.
-        value = import_final(f'{countryName}/{append_name}')
+        # Now import the data. Rows outside the index, like the income
+        # groups, are read from their file.
+        if index.has_entry(countryName, head):
+            value = index.get_last_valid(countryName, head)[0]
+        else:
+            value = import_final(f'{countryName}/{append_name}')
         if value is None:
             column.append('')
         else:
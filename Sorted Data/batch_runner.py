@@ -0,0 +1,330 @@
+"""
+Scientific Data Analysis - 2021-22 - Project
+
+Non-interactive batch runner for the analyses of the interactive scripts
+(Command_Line_Extractor.py, subset_extractor.py, bootstrap_analysis.py,
+subsets_pvalues_histograms.py, country_subsets.py, pearson_correlation.py and
+correlation_matrix.py). The parameters come from a JSON job spec instead of
+input() prompts, the data of all countries is loaded once for every variable,
+and all tables and figures are written to an output directory instead of
+being shown.
+
+The program is run from the Sorted Data directory by:
+python batch_runner.py job.json
+
+Job spec keys (all optional):
+- output: the output directory, default 'batch_output'
+- analyses: any of 'extract', 'subset_extract', 'bootstrap', 'subsets',
+  'pearson' and 'correlations', default all
+- variables: a list of variable names, or 'all' (the default) for every
+  variable
+- minimal_value: the lower limit cutoff-value, default 0.0
+- subset_file: the subset of subset_extractor.py, a file with the subset name
+  on the first line and a country per line after it, default
+  'Subset_Input_File.txt'
+- subset_size: the bootstrap subset size of the bootstrap analysis, default 5
+- bootstrap_samples: the number of bootstrap samples, default 10000
+- seed: the random seed, default none
+- workers: the number of worker processes for the bootstrap, default 1
+- subsets: 'regimes' (the default) for the democracy index regime types, or an
+  object mapping subset names to country lists
+- edges: the ascending democracy index scores that separate the regime types,
+  default [40, 60, 80] for the four regime types, see regimes.py
+- labels: the names of the regime types from the lowest scores to the highest,
+  default the four regime types, or the score ranges for other edges
+- year: the year of the democracy index scores in democracy_index.txt, or a
+  [first, last] range of years for the mean score per country, default none for
+  the 2020 scores of democracy_index_2020.txt
+- permutations: the maximum number of permutations per subset test, default
+  100000
+- statistic: 'mean' (the default) or 'median', the statistic of the subset
+  tests
+- correction: the multiple-comparison correction of the subset tests, 'holm'
+  (the default), 'bonferroni', 'fdr_bh' or 'none'
+- pairs: a list of [x-variable, y-variable] pairs for the Pearson correlation
+- scale: 'linear' (the default) or 'log' for the Pearson correlation
+"""
+
+import bootstrap
+import consolidator
+import correlation_matrix
+import csv
+import data_importer
+import json
+import latest_index
+import os
+import permutation
+import regimes
+import sys
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from scipy import stats
+
+DEFAULTS = {
+    'output': 'batch_output',
+    'analyses': ['extract', 'subset_extract', 'bootstrap', 'subsets',
+                 'pearson', 'correlations'],
+    'variables': 'all',
+    'minimal_value': 0.0,
+    'subset_file': 'Subset_Input_File.txt',
+    'subset_size': 5,
+    'bootstrap_samples': 10000,
+    'seed': None,
+    'workers': 1,
+    'subsets': 'regimes',
+    'edges': list(regimes.REGIME_EDGES),
+    'labels': None,
+    'year': None,
+    'permutations': 100000,
+    'statistic': 'mean',
+    'correction': 'holm',
+    'pairs': [],
+    'scale': 'linear',
+}
+
+
+def load_subsets(spec, countries):
+    """Returns a dictionary of subset names to arrays of country indices."""
+    if spec['subsets'] == 'regimes':
+        scores = regimes.load_scores(countries, spec['year'])
+        if spec['year'] is not None:
+            missing = regimes.unscored(countries, scores)
+            if missing:
+                print(f"Warning: no democracy index score in "
+                      f"{spec['year']} for {', '.join(missing)}.")
+        return regimes.bucket(scores, spec['edges'], spec['labels'])
+
+    index = {country: i for i, country in enumerate(countries)}
+    return {
+        name: np.array(
+            [index[c] for c in members if c in index], dtype=np.int64
+        )
+        for name, members in spec['subsets'].items()
+    }
+
+
+def write_table(path, header, rows):
+    """Writes a table of rows to a CSV file."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def run_extract(spec, countries, variables, values):
+    """Writes the country data table of Command_Line_Extractor.py for all
+    variables at once."""
+    rows = [
+        [country] + values[i].tolist() for i, country in enumerate(countries)
+    ]
+    write_table(
+        os.path.join(spec['output'], 'countries_data.csv'),
+        ['Country'] + variables, rows
+    )
+
+
+def run_subset_extract(spec, countries, variables, values):
+    """Writes the subset table of subset_extractor.py for all variables at
+    once: the value of every country of the subset and their average.
+    Countries that are not in countries.txt are left out."""
+    with open(spec['subset_file']) as f:
+        lines = [line.strip() for line in f.read().splitlines()]
+    name = lines[0]
+    index = {country: i for i, country in enumerate(countries)}
+    members = [c for c in lines[1:] if c in index]
+    subset = values[[index[c] for c in members]]
+    rows = [[name, c] + subset[i].tolist() for i, c in enumerate(members)]
+    if members:
+        rows.append([name, 'Average'] + subset.mean(axis=0).tolist())
+    write_table(
+        os.path.join(spec['output'], 'subset_extract.csv'),
+        ['Subset', 'Country'] + variables, rows
+    )
+
+
+def run_bootstrap(spec, variables, latest, seeds):
+    """Runs the bootstrap analysis of bootstrap_analysis.py per variable."""
+    rows = []
+    for j, variable in enumerate(variables):
+        data = latest[:, j][~np.isnan(latest[:, j])]
+        if len(data) == 0:
+            continue
+        means, mean, interval = bootstrap.bootstrap(
+            data, spec['subset_size'], spec['bootstrap_samples'], seeds[j],
+            workers=spec['workers']
+        )
+        rows.append([variable, len(data), data.mean(), mean, *interval])
+
+        plt.title(str(spec['bootstrap_samples']) + ' subsamples of ' +
+                  variable + ' with subset-size ' + str(spec['subset_size']))
+        plt.xlabel(variable)
+        plt.ylabel('Frequency')
+        plt.hist(means, bins=50)
+        plt.vlines(mean, ymin=0, ymax=spec['bootstrap_samples'], color='r',
+                   label='Mean: ' + str(round(mean, 4)))
+        plt.legend()
+        plt.savefig(os.path.join(spec['output'], f'bootstrap_{variable}.png'))
+        plt.close()
+
+    write_table(
+        os.path.join(spec['output'], 'bootstrap.csv'),
+        ['Variable', 'Countries', 'Mean', 'Bootstrap mean', 'CI low',
+         'CI high'],
+        rows
+    )
+
+
+def run_subsets(spec, variables, latest, subsets, seeds):
+    """Runs the subset comparison of subsets_pvalues_histograms.py and
+    country_subsets.py per variable: bootstrap histograms per subset and
+    permutation tests between the country values of every pair of subsets.
+    Countries without a value count as 0.0, like in the interactive scripts."""
+    summary_rows = []
+    test_rows = []
+    for j, variable in enumerate(variables):
+        column = np.nan_to_num(latest[:, j], nan=0.0)
+        subset_seeds = seeds[j].spawn(len(subsets))
+        test_seed = seeds[j].spawn(1)[0]
+        groups = {}
+        plt.title('Subsets ' + variable + ' with ' +
+                  str(spec['bootstrap_samples']) + ' samples ')
+        plt.xlabel(variable)
+        plt.ylabel('Frequency')
+        for (name, members), seed in zip(subsets.items(), subset_seeds):
+            if len(members) == 0:
+                continue
+            data = column[members]
+            means, mean, interval = bootstrap.bootstrap(
+                data, len(data), spec['bootstrap_samples'], seed,
+                workers=spec['workers']
+            )
+            groups[name] = data
+            summary_rows.append(
+                [variable, name, len(data), data.mean(), mean, *interval]
+            )
+            plt.hist(means, bins=50, label=name, alpha=0.5)
+        plt.legend()
+        plt.savefig(os.path.join(spec['output'], f'subsets_{variable}.png'))
+        plt.close()
+
+        tests = permutation.pairwise_tests(
+            groups, spec['statistic'], spec['permutations'], test_seed,
+            correction=spec['correction']
+        )
+        test_rows.extend([variable, *test] for test in tests)
+
+    write_table(
+        os.path.join(spec['output'], 'subsets.csv'),
+        ['Variable', 'Subset', 'Countries', 'Mean', 'Bootstrap mean',
+         'CI low', 'CI high'],
+        summary_rows
+    )
+    write_table(
+        os.path.join(spec['output'], 'subsets_tests.csv'),
+        ['Variable', 'Subset A', 'Subset B', 'Difference', 'p-value',
+         'Adjusted p-value', 'Permutations'],
+        test_rows
+    )
+
+
+def run_pearson(spec, variables, values):
+    """Runs the correlation of pearson_correlation.py for every pair."""
+    index = {variable: j for j, variable in enumerate(variables)}
+    rows = []
+    for var1, var2 in spec['pairs']:
+        x = values[:, index[var1]]
+        y = values[:, index[var2]]
+        # Skip countries without a value for either variable
+        present = ~np.isnan(x) & ~np.isnan(y)
+        x, y = x[present], y[present]
+        if spec['scale'] == 'log':
+            result = stats.linregress(np.log10(x + 1), np.log10(y + 1))
+        else:
+            result = stats.linregress(x, y)
+        rows.append([var1, var2, spec['scale'], len(x), result.rvalue,
+                     result.pvalue, result.slope, result.intercept])
+
+        plt.title(var1 + ' vs ' + var2 + ' for all countries')
+        plt.xlabel(var1)
+        plt.ylabel(var2)
+        plt.scatter(x, y)
+        order = np.argsort(x)
+        if spec['scale'] == 'log':
+            fit = 10 ** (result.intercept +
+                         result.slope * np.log10(x[order] + 1)) - 1
+            plt.xscale('log')
+            plt.yscale('log')
+        else:
+            fit = result.intercept + result.slope * x[order]
+        plt.plot(x[order], fit, label='Regression', color='r')
+        plt.savefig(
+            os.path.join(spec['output'], f'pearson_{var1}_vs_{var2}.png')
+        )
+        plt.close()
+
+    write_table(
+        os.path.join(spec['output'], 'pearson.csv'),
+        ['Variable 1', 'Variable 2', 'Scale', 'Countries', 'Pearson R',
+         'p-value', 'Slope', 'Intercept'],
+        rows
+    )
+
+
+def run(spec):
+    """Runs all analyses of a job spec."""
+    spec = dict(DEFAULTS, **spec)
+    os.makedirs(spec['output'], exist_ok=True)
+    countries = data_importer.list_countries()
+    variables = spec['variables']
+    if variables == 'all':
+        variables = consolidator.list_variables(countries[0])
+
+    # The latest value of every variable for every country, loaded once for
+    # all analyses; see latest_index.py.
+    latest, final = latest_index.LatestIndex().get_snapshot(
+        variables, spec['minimal_value']
+    )
+    # The extracted table falls back on the final value, like
+    # Command_Line_Extractor.py, NaN for countries without records.
+    values = np.where(np.isnan(latest), final, latest)
+    # One independent random stream per variable and analysis.
+    bootstrap_seeds, subset_seeds = \
+        np.random.SeedSequence(spec['seed']).spawn(2)
+    bootstrap_seeds = bootstrap_seeds.spawn(len(variables))
+    subset_seeds = subset_seeds.spawn(len(variables))
+
+    if 'extract' in spec['analyses']:
+        run_extract(
+            spec, countries, variables, np.nan_to_num(values, nan=0.0)
+        )
+    if 'subset_extract' in spec['analyses']:
+        run_subset_extract(
+            spec, countries, variables, np.nan_to_num(values, nan=0.0)
+        )
+    if 'bootstrap' in spec['analyses']:
+        run_bootstrap(spec, variables, latest, bootstrap_seeds)
+    if 'subsets' in spec['analyses']:
+        subsets = load_subsets(spec, countries)
+        run_subsets(spec, variables, latest, subsets, subset_seeds)
+    if 'pearson' in spec['analyses']:
+        run_pearson(spec, variables, values)
+    if 'correlations' in spec['analyses']:
+        indicators, indicator_values = \
+            correlation_matrix.load_indicators(countries)
+        correlation_matrix.write_correlations(
+            spec['output'], variables + indicators,
+            np.concatenate([values, indicator_values], axis=1)
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print('Usage: python batch_runner.py job.json')
+        exit(1)
+
+    with open(sys.argv[1]) as f:
+        job = json.load(f)
+    run(job)
+    print(f"Written to directory [{dict(DEFAULTS, **job)['output']}]")
@@ -0,0 +1,273 @@
+"""
+Shared bootstrap engine for the analysis scripts.
+
+All resample indices are drawn as (chunk, subset size) integer matrices from
+a seeded numpy.random.Generator and averaged per chunk, so even 10^6
+resamples run as a handful of Numpy operations with bounded memory. Large
+runs can be spread over a process pool with reproducible per-block streams,
+and bootstrap_summary folds the means into running statistics instead of
+keeping them, for sample counts that do not fit in memory.
+"""
+
+from multiprocessing import Pool
+from typing import Iterable, Tuple, Union
+import numpy as np
+
+# Upper bound on the number of resample indices drawn at once.
+CHUNK_ELEMENTS = 2 ** 22
+# Number of resamples per block. Each block draws from its own random stream,
+# so the results do not depend on how blocks are spread over workers.
+BLOCK_SAMPLES = 2 ** 16
+# Half width of the histogram range of bootstrap_summary, in standard errors
+# of the resample mean.
+SUMMARY_SPREAD = 6.0
+
+Seed = Union[None, int, np.random.SeedSequence]
+
+
+def _block_means(task: Tuple[np.ndarray, int, int, np.random.SeedSequence]
+                 ) -> np.ndarray:
+    """Returns the resample means of a single block, see bootstrap_means."""
+    data, subset_size, samples, sequence = task
+    generator = np.random.default_rng(sequence)
+    means = np.empty(samples)
+    chunk = max(1, CHUNK_ELEMENTS // max(1, subset_size))
+    for start in range(0, samples, chunk):
+        stop = min(start + chunk, samples)
+        indices = generator.integers(
+            0, len(data), size=(stop - start, subset_size)
+        )
+        means[start:stop] = data[indices].mean(axis=1)
+
+    return means
+
+
+def _blocks(data: np.ndarray, subset_size: int, bootstrap_samples: int,
+            seed: Seed):
+    """Yields the fixed blocks of resamples, each with its own random
+    stream spawned from the seed.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+
+    starts = range(0, bootstrap_samples, BLOCK_SAMPLES)
+    for start, sequence in zip(starts, seed.spawn(len(starts))):
+        samples = min(BLOCK_SAMPLES, bootstrap_samples - start)
+        yield data, subset_size, samples, sequence
+
+
+def bootstrap_means(data: Iterable[float], subset_size: int,
+                    bootstrap_samples: int, seed: Seed = None,
+                    workers: int = 1) -> np.ndarray:
+    """Resamples the data with replacement and returns the mean of each
+    resample.
+
+    The resamples are split into fixed blocks that each get an independent
+    stream from SeedSequence.spawn, so the same seed gives the same means
+    regardless of the number of workers.
+
+    Args:
+        data (Iterable[float]): The original sample.
+        subset_size (int): The size of each resample.
+        bootstrap_samples (int): The number of resamples.
+        seed (Seed): The seed (or SeedSequence) of the random streams, or
+        None for fresh, unpredictable ones.
+        workers (int): The number of processes to spread the blocks over.
+
+    Returns:
+        np.ndarray: The array of resample means.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    tasks = list(_blocks(data, subset_size, bootstrap_samples, seed))
+    if workers <= 1 or len(tasks) <= 1:
+        parts = [_block_means(task) for task in tasks]
+    else:
+        with Pool(min(workers, len(tasks))) as pool:
+            parts = pool.map(_block_means, tasks)
+
+    if len(parts) == 0:
+        return np.empty(0)
+    return np.concatenate(parts)
+
+
+class StreamingSummary:
+    """Constant-memory summary of a stream of bootstrap means: running
+    moments (Welford, merged batch-wise), a fixed-bin histogram for plotting
+    and a fine-grained histogram that serves as a quantile sketch.
+
+    The bin edges are fixed up front; values outside them are counted in the
+    outer bins.
+    """
+
+    def __init__(self, low: float, high: float, bins: int = 50,
+                 sketch_bins: int = 2 ** 14):
+        if not high > low:
+            high = low + 1.0
+        self.__low = low
+        self.__high = high
+        self.__count = 0
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        self.__histogram = np.zeros(bins, dtype=np.int64)
+        self.__sketch = np.zeros(sketch_bins, dtype=np.int64)
+
+    def __bin(self, values: np.ndarray, bins: int) -> np.ndarray:
+        scale = bins / (self.__high - self.__low)
+        index = ((values - self.__low) * scale).astype(np.int64)
+        return np.bincount(np.clip(index, 0, bins - 1), minlength=bins)
+
+    def __merge_moments(self, count: int, mean: float, m2: float):
+        total = self.__count + count
+        if total == 0:
+            return
+        delta = mean - self.__mean
+        self.__mean += delta * count / total
+        self.__m2 += m2 + delta * delta * self.__count * count / total
+        self.__count = total
+
+    def update(self, values: np.ndarray):
+        """Adds a batch of values to the summary."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        mean = float(values.mean())
+        self.__merge_moments(
+            len(values), mean, float(((values - mean) ** 2).sum())
+        )
+        self.__histogram += self.__bin(values, len(self.__histogram))
+        self.__sketch += self.__bin(values, len(self.__sketch))
+
+    def merge(self, other: 'StreamingSummary'):
+        """Adds the contents of another summary with the same bins."""
+        self.__merge_moments(other.__count, other.__mean, other.__m2)
+        self.__histogram += other.__histogram
+        self.__sketch += other.__sketch
+
+    def get_count(self) -> int:
+        """Returns the number of values seen."""
+        return self.__count
+
+    def get_mean(self) -> float:
+        """Returns the mean of the values seen."""
+        return self.__mean
+
+    def get_variance(self) -> float:
+        """Returns the sample variance of the values seen."""
+        return self.__m2 / (self.__count - 1) if self.__count > 1 else 0.0
+
+    def get_histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the histogram counts and bin edges, ready for
+        plt.hist(edges[:-1], bins=edges, weights=counts).
+        """
+        edges = np.linspace(
+            self.__low, self.__high, len(self.__histogram) + 1
+        )
+        return self.__histogram.copy(), edges
+
+    def quantile(self, q):
+        """Returns the approximate q-th quantile(s) of the values seen,
+        interpolated within a sketch bin, for q in [0, 1].
+        """
+        cumulative = np.cumsum(self.__sketch)
+        edges = np.linspace(self.__low, self.__high, len(self.__sketch) + 1)
+        # Position of each quantile along the cumulative bin counts.
+        return np.interp(
+            np.asarray(q) * cumulative[-1],
+            np.concatenate(([0], cumulative)), edges
+        )
+
+    def percentile_interval(self,
+                            confidence: float = 0.95) -> Tuple[float, float]:
+        """Returns the approximate percentile confidence interval."""
+        tail = (1.0 - confidence) / 2.0
+        lower, upper = self.quantile([tail, 1.0 - tail])
+        return float(lower), float(upper)
+
+
+def percentile_interval(means: np.ndarray,
+                        confidence: float = 0.95) -> Tuple[float, float]:
+    """Returns the percentile confidence interval of bootstrap means.
+
+    Args:
+        means (np.ndarray): The resample means.
+        confidence (float): The confidence level of the interval.
+
+    Returns:
+        Tuple[float, float]: The lower and upper bound of the interval.
+    """
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    lower, upper = np.percentile(means, [tail, 100.0 - tail])
+    return float(lower), float(upper)
+
+
+def bootstrap(data: Iterable[float], subset_size: int,
+              bootstrap_samples: int, seed: Seed = None,
+              confidence: float = 0.95, workers: int = 1
+              ) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """Bootstraps the mean of the data.
+
+    Args:
+        data (Iterable[float]): The original sample.
+        subset_size (int): The size of each resample.
+        bootstrap_samples (int): The number of resamples.
+        seed (Seed): The seed (or SeedSequence) of the random streams.
+        confidence (float): The confidence level of the interval.
+        workers (int): The number of processes to spread the work over.
+
+    Returns:
+        Tuple[np.ndarray, float, Tuple[float, float]]: The resample means,
+        their mean and their percentile confidence interval.
+    """
+    means = bootstrap_means(
+        data, subset_size, bootstrap_samples, seed, workers
+    )
+    return means, float(np.mean(means)), percentile_interval(means, confidence)
+
+
+def _block_summary(task) -> StreamingSummary:
+    """Returns the summary of a single block, see bootstrap_summary."""
+    block, low, high, bins = task
+    summary = StreamingSummary(low, high, bins)
+    summary.update(_block_means(block))
+    return summary
+
+
+def bootstrap_summary(data: Iterable[float], subset_size: int,
+                      bootstrap_samples: int, seed: Seed = None,
+                      workers: int = 1, bins: int = 50) -> StreamingSummary:
+    """Bootstraps the mean of the data in constant memory: the means of each
+    block are folded into a StreamingSummary and then discarded. Blocks and
+    random streams are the same as in bootstrap_means.
+
+    Args:
+        data (Iterable[float]): The original sample.
+        subset_size (int): The size of each resample.
+        bootstrap_samples (int): The number of resamples.
+        seed (Seed): The seed (or SeedSequence) of the random streams.
+        workers (int): The number of processes to spread the blocks over.
+        bins (int): The number of bins of the plotting histogram.
+
+    Returns:
+        StreamingSummary: The summary of all resample means.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    # The resample means are spread around the mean of the data by its
+    # standard error, so bins over the whole range of the data would leave
+    # most of them empty. They never leave that range, though.
+    spread = SUMMARY_SPREAD * data.std() / np.sqrt(subset_size)
+    low = float(max(data.min(), data.mean() - spread))
+    high = float(min(data.max(), data.mean() + spread))
+    summary = StreamingSummary(low, high, bins)
+    tasks = (
+        (block, low, high, bins)
+        for block in _blocks(data, subset_size, bootstrap_samples, seed)
+    )
+    if workers <= 1:
+        for task in tasks:
+            summary.merge(_block_summary(task))
+    else:
+        with Pool(workers) as pool:
+            for part in pool.imap(_block_summary, tasks):
+                summary.merge(part)
+
+    return summary
@@ -7,17 +7,19 @@ from the sorted data directory.
 
 The program is run by:
 python bootstrap.py 
-Whem prompted input the exact filename of the variable you want to analyse, followed by three optional prompts:
+Whem prompted input the exact filename of the variable you want to analyse, followed by four optional prompts:
 - minimal_value for the data input, with default value = 0.0
 - subset_size, which controls the size of the bootstrapped subset, with default value = 5
 - bootstrap_samples, which controls the number of bootstrapped samples, with default value = 10000
+- seed, which makes the resampling reproducible, by default a random seed is used
 
 As a result of the shown histogram decisions can be made how to manipulate the data and calculate the p-values.
 """
 
 
 
-import data_importer
+import bootstrap
+import latest_index
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -31,36 +33,30 @@ if __name__ == "__main__":
     minimal_value = float(input("Minimal value:") or '0.0')
     subset_size = int(input('Bootstrap Subset Size: ') or '5')
     bootstrap_samples = int(input('Number Of Bootstrap Samples: ') or '10000')
+    seed = input('Random Seed (optional): ')
+    seed = int(seed) if seed else None
     
+    # Latest values of all countries, recomputed only for changed data files.
+    index = latest_index.LatestIndex()
+
     country_dict = {}
     data_list = []
     for country in countries_list:
-        # Select the user-input data
-        data = np.array(data_importer.import_numerics_handle_none(
-            str(country + '/' + user_input + '.data'), 0.0
-        ))
-
         # Default data of the country
-        country_dict[country] = data[-1]
+        country_dict[country] = index.get_final(country, user_input)
 
         # Get the first value larger than 0.0 or the minimal_value
-        for i in range(1, 8):
-            temp = data[-i]
-            if temp <= minimal_value:
-                continue
-            elif temp > minimal_value:
-                data_list.append(temp)
-                country_dict[country] = temp
-                break
+        temp = index.get_latest(country, user_input, minimal_value)
+        if temp is not None:
+            data_list.append(temp)
+            country_dict[country] = temp
 
     # Set up orginial data and bootstrapping parameters and perform the bootstrap resampling
     data_mean = sum(data_list)/len(data_list)
-    resampled_data_list = []
-    for i in range(bootstrap_samples):
-        temp = np.random.choice(data_list, subset_size)
-        resampled_data_list.append(sum(temp)/len(temp))
-
-    resampled_data_mean = sum(resampled_data_list)/len(resampled_data_list)
+    resampled_data_list, resampled_data_mean, interval = bootstrap.bootstrap(
+        data_list, subset_size, bootstrap_samples, seed
+    )
+    print('95% confidence interval: ', interval)
     plot_mean = str('Mean: ' + str(round(resampled_data_mean, 4)))
 
     # Plot histogram of the data
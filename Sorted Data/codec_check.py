@@ -0,0 +1,105 @@
+# Small script that checks the .data writers of data_importer against its
+# readers, for testing purposes. Random series (any length, NaN, infinities,
+# signed zeros, subnormals, random masks) and random date sequences are
+# exported and decoded again, and must come back bit for bit. Every file of
+# the given countries is also decoded and exported again, which must
+# reproduce its bytes exactly. Run from the Sorted Data directory:
+#   python codec_check.py [rounds] [seed] [country ...]
+import data_importer
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Values that the float encoding must keep exactly.
+SPECIAL_VALUES = np.array([
+    0.0, -0.0, np.nan, np.inf, -np.inf, 5e-324, -5e-324,
+    np.finfo(np.float64).max, np.finfo(np.float64).min,
+    np.finfo(np.float64).tiny, 1.0 / 3.0
+])
+
+
+def random_values(generator: np.random.Generator, length: int) -> np.ndarray:
+    """Returns random floats: random bit patterns mixed with special values."""
+    values = generator.integers(
+        0, 2 ** 64, size=length, dtype=np.uint64
+    ).view(np.float64)
+    special = generator.random(length) < 0.2
+    values[special] = generator.choice(SPECIAL_VALUES, size=special.sum())
+    return values
+
+
+def random_dates(generator: np.random.Generator, length: int) -> np.ndarray:
+    """Returns random datetime64[D] dates from 1900 to 2100, some NaT."""
+    dates = np.datetime64('1900-01-01') + generator.integers(
+        0, 73049, size=length
+    ).astype('timedelta64[D]')
+    dates[generator.random(length) < 0.1] = np.datetime64('NaT')
+    return dates
+
+
+def check_round_trips(rounds: int, seed: int, directory: str) -> int:
+    """Exports and decodes random series and dates, returning the number of
+    failed rounds."""
+    generator = np.random.default_rng(seed)
+    numerics_path = os.path.join(directory, 'values.data')
+    dates_path = os.path.join(directory, 'date.data')
+    failures = 0
+    for i in range(rounds):
+        length = int(generator.choice([0, 1, 2, generator.integers(3, 2000)]))
+        values = random_values(generator, length)
+        mask = generator.random(length) < 0.7
+        data_importer.export_numerics(numerics_path, values, mask)
+        decoded, decoded_mask = data_importer.decode_numerics(numerics_path)
+        bits = values.view(np.uint64)
+        ok = os.path.getsize(numerics_path) == length * 9 and \
+            np.array_equal(decoded_mask, mask) and \
+            np.array_equal(decoded.view(np.uint64)[mask], bits[mask]) and \
+            not decoded[~mask].any()
+
+        dates = random_dates(generator, length)
+        data_importer.export_dates(dates_path, dates)
+        decoded_dates, dates_mask = data_importer.decode_dates(dates_path)
+        ok &= os.path.getsize(dates_path) == length * 5 and \
+            np.array_equal(dates_mask, ~np.isnat(dates)) and \
+            np.array_equal(decoded_dates, dates, equal_nan=True)
+
+        if not ok:
+            failures += 1
+            print(f'Round {i} (length {length}) did not round-trip.')
+    return failures
+
+
+def check_files(countries, directory: str) -> int:
+    """Decodes and exports every file of the given countries again,
+    returning the number of files whose bytes changed."""
+    failures = 0
+    path = os.path.join(directory, 'copy.data')
+    for country in countries:
+        for name in sorted(os.listdir(country)):
+            filepath = f'{country}/{name}'
+            if name == 'date.data':
+                dates, mask = data_importer.decode_dates(filepath)
+                data_importer.export_dates(path, dates, mask)
+            elif name.endswith('.data') and name != 'tests_units.data':
+                values, mask = data_importer.decode_numerics(filepath)
+                data_importer.export_numerics(path, values, mask)
+            else:
+                continue
+            with open(filepath, 'rb') as a, open(path, 'rb') as b:
+                if a.read() != b.read():
+                    failures += 1
+                    print(f'{filepath} changed after a round trip.')
+    return failures
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    countries = sys.argv[3:] or ['Netherlands']
+    with tempfile.TemporaryDirectory() as directory:
+        failures = check_round_trips(rounds, seed, directory)
+        failures += check_files(countries, directory)
+    print(f'{rounds} random round trips and the files of {len(countries)} '
+          f'countries checked: {failures} failure(s).')
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,115 @@
+# Packs the data of every country into a single country x variable x date
+# cube file, so cross-country analyses can memory-map one file instead of
+# opening thousands of small .data files. See data_importer.Cube for the
+# reader side. Run from the Sorted Data directory:
+#   python consolidator.py [output_file]
+import data_importer
+import json
+import os
+import struct
+import sys
+from typing import List
+import numpy as np
+
+# Files in a country directory that are not numeric series.
+NON_NUMERIC = ('date.data', 'tests_units.data')
+
+
+def list_variables(country: str) -> List[str]:
+    """Returns the sorted names of all numeric variables stored for the given
+    country.
+
+    Args:
+        country (str): The name of the country directory.
+
+    Returns:
+        List[str]: The variable names, without .data extension.
+    """
+    return sorted(
+        name[:-5] for name in os.listdir(country)
+        if name.endswith('.data') and name not in NON_NUMERIC
+    )
+
+
+def consolidate(filepath: str = 'data_cube.bin') -> None:
+    """Writes the data of all countries to a single cube file.
+
+    The file starts with data_importer.CUBE_MAGIC, followed by the length of
+    a JSON header (little-endian 64-bit), the header itself (country names,
+    variable names, first date and number of dates), the float64 values laid
+    out as [country][variable][date] with NaN where no value is present, and
+    finally the validity bitmask packed along the date axis.
+
+    Args:
+        filepath (str): The path of the cube file to write.
+    """
+    countries = data_importer.list_countries()
+    variables = list_variables(countries[0])
+
+    # The date axis spans every date seen in any country.
+    country_dates = [
+        data_importer.decode_dates(f'{country}/date.data')
+        for country in countries
+    ]
+    known = np.concatenate([dates[mask] for dates, mask in country_dates])
+    start = known.min()
+    num_dates = int((known.max() - start).astype(int)) + 1
+
+    header = json.dumps({
+        'countries': countries,
+        'variables': variables,
+        'start': str(start),
+        'dates': num_dates,
+    }).encode('utf8')
+    # Pad the header with spaces so the values start 8-byte aligned.
+    prefix = len(data_importer.CUBE_MAGIC) + 8
+    header += b' ' * (-(prefix + len(header)) % 8)
+    offset = prefix + len(header)
+
+    shape = (len(countries), len(variables), num_dates)
+    bits_shape = shape[:2] + ((num_dates + 7) // 8,)
+    values_size = int(np.prod(shape)) * 8
+    with open(filepath, 'wb') as file:
+        file.write(data_importer.CUBE_MAGIC)
+        file.write(struct.pack('<Q', len(header)))
+        file.write(header)
+        file.truncate(offset + values_size + int(np.prod(bits_shape)))
+
+    # Fill the cube one country at a time to keep memory bounded.
+    values = np.memmap(
+        filepath, dtype='<f8', mode='r+', offset=offset, shape=shape
+    )
+    bits = np.memmap(
+        filepath, dtype=np.uint8, mode='r+', offset=offset + values_size,
+        shape=bits_shape
+    )
+    for i, country in enumerate(countries):
+        print(f'Packing data for country [{country}]')
+        dates, date_mask = country_dates[i]
+        block = np.full(shape[1:], np.nan)
+        valid = np.zeros(shape[1:], dtype=bool)
+        for j, variable in enumerate(variables):
+            path = f'{country}/{variable}.data'
+            if not os.path.exists(path):
+                continue
+
+            series, mask = data_importer.decode_numerics(path)
+            # Records line up with the dates; skip those without a date.
+            n = min(len(series), len(dates))
+            keep = date_mask[:n]
+            index = (dates[:n][keep] - start).astype(int)
+            present = mask[:n][keep]
+            block[j, index] = np.where(present, series[:n][keep], np.nan)
+            valid[j, index] = present
+
+        values[i] = block
+        bits[i] = np.packbits(valid, axis=-1)
+
+    values.flush()
+    bits.flush()
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else 'data_cube.bin'
+    consolidate(target)
+    print(f'Written to file [{target}]')
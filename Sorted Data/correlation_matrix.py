@@ -0,0 +1,208 @@
+"""
+Scientific Data Analysis - 2021-22 - Project
+
+Correlation-matrix mode of pearson_correlation.py: instead of one typed pair
+of variables per run, the Pearson, Spearman and log-log (Pearson of
+log10(x + 1), as in pearson_correlation.py) correlations of all pairs of
+variables and EIU indicators are computed at once, with their p-values and
+the number of countries of every pair. A country only counts for a pair if
+both of its values are present (pairwise deletion), so every pair uses as
+many countries as possible.
+
+The values per country are the ones Command_Line_Extractor.py selects: the
+latest value above the cut-off within the final seven records, otherwise the
+final record. The EIU indicators are the 2020 democracy index of
+democracy_index_2020.txt and the 2020 indicators of ../data/EIU_Data.csv
+(through eiuData.py).
+
+The program is run from the Sorted Data directory by:
+python correlation_matrix.py [output_directory] [minimal_value]
+It writes correlations.csv, with one row per pair and method, and
+correlations.npz, with the full matrices.
+"""
+
+import consolidator
+import csv
+import data_importer
+import latest_index
+import os
+import regimes
+import sys
+from typing import List, Tuple
+import numpy as np
+from scipy import stats
+
+# eiuData.py lives in the parent directory, next to the data directory.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import eiuData
+
+METHODS = ('pearson', 'spearman', 'log')
+EIU_PATH = '../data/EIU_Data.csv'
+EIU_CACHE = '../data/EIU_Data.npz'
+
+
+def _pearson(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Returns the Pearson correlation of every column of x with the matching
+    column of y, both NaN at the same places."""
+    x = x - np.nanmean(x, axis=0)
+    y = y - np.nanmean(y, axis=0)
+    return np.nansum(x * y, axis=0) / np.sqrt(
+        np.nansum(x * x, axis=0) * np.nansum(y * y, axis=0)
+    )
+
+
+def _pearson_matrix(values: np.ndarray) -> np.ndarray:
+    """Returns the matrix of pairwise Pearson correlations of the columns,
+    from sums over the rows where both columns are present."""
+    valid = ~np.isnan(values)
+    present = valid.astype(np.float64)
+    # Centre every column first, to limit cancellation in the sums below.
+    counts = present.sum(axis=0)
+    means = np.where(valid, values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+    x = np.where(valid, values - means, 0.0)
+
+    n = present.T @ present
+    # sums[i, j] is the sum of column i over the rows where j is present too.
+    sums = x.T @ present
+    squares = (x * x).T @ present
+    covariance = x.T @ x - sums * sums.T / n
+    variance = squares - sums * sums / n
+    return covariance / np.sqrt(variance * variance.T)
+
+
+def _spearman_matrix(values: np.ndarray) -> np.ndarray:
+    """Returns the matrix of pairwise Spearman correlations of the columns.
+    Ranks depend on which rows a pair shares, so they are computed per
+    column, against all other columns at once."""
+    valid = ~np.isnan(values)
+    r = np.empty((values.shape[1], values.shape[1]))
+    for i in range(values.shape[1]):
+        joint = valid & valid[:, [i]]
+        ranks = stats.rankdata(
+            np.where(joint, values, np.nan), axis=0, nan_policy='omit'
+        )
+        own_ranks = stats.rankdata(
+            np.where(joint, values[:, [i]], np.nan), axis=0,
+            nan_policy='omit'
+        )
+        r[i] = _pearson(own_ranks, ranks)
+
+    return r
+
+
+def correlation_matrix(values: np.ndarray, method: str = 'pearson'
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Correlates all pairs of columns of a matrix, using for each pair the
+    rows where both values are present.
+
+    Args:
+        values (np.ndarray): The (country, variable) matrix, NaN where no
+        value is present.
+        method (str): 'pearson', 'spearman' or 'log' (Pearson correlation of
+        log10(x + 1), values of -1 or less count as not present).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The (variable, variable)
+        matrices of the correlation coefficients, their two-sided p-values
+        and the numbers of rows used. Coefficients and p-values are NaN for
+        pairs with fewer than three rows or a constant variable.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    present = (~np.isnan(values)).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if method == 'log':
+            values = np.log10(np.where(values > -1.0, values, np.nan) + 1.0)
+            present = (~np.isnan(values)).astype(np.float64)
+            r = _pearson_matrix(values)
+        elif method == 'pearson':
+            r = _pearson_matrix(values)
+        elif method == 'spearman':
+            r = _spearman_matrix(values)
+        else:
+            raise ValueError(f'Unknown correlation method [{method}].')
+
+        n = (present.T @ present).astype(np.int64)
+        r = np.clip(r, -1.0, 1.0)
+        r[n < 3] = np.nan
+        # The coefficient follows a t distribution with n - 2 degrees of
+        # freedom under the null hypothesis, as in scipy.stats.pearsonr.
+        dof = np.maximum(n - 2, 1)
+        t = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p = 2.0 * stats.t.sf(np.abs(t), dof)
+
+    return r, p, n
+
+
+def load_indicators(countries: List[str]) -> Tuple[List[str], np.ndarray]:
+    """Loads the 2020 democracy index (see regimes.py) and the 2020 EIU
+    indicators (see eiuData.py) for the given countries. The EIU countries
+    are matched by name or through binder.txt.
+
+    Returns:
+        Tuple[List[str], np.ndarray]: The indicator names and the (country,
+        indicator) matrix, NaN where a country has no value.
+    """
+    index = {country: i for i, country in enumerate(countries)}
+    with open('binder.txt', 'r') as file:
+        for line in file.read().splitlines():
+            parts = line.split(':')
+            if len(parts) == 2 and parts[1].strip() in index:
+                index.setdefault(parts[0].strip(), index[parts[1].strip()])
+
+    eiu = eiuData.load(EIU_PATH, EIU_CACHE)
+    rows = [index.get(country, -1) for country in eiu.countries.tolist()]
+    known = np.array([row >= 0 for row in rows], dtype=bool)
+    indicators = np.full((len(countries), len(eiu.indicators)), np.nan)
+    indicators[np.array(rows)[known]] = eiu.year(2020)[known]
+
+    names = ['democracy_index'] + [
+        f'EIU20{indicator}' for indicator in eiu.indicators.tolist()
+    ]
+    values = np.column_stack(
+        (regimes.load_scores(countries), indicators)
+    )
+    return names, values
+
+
+def write_correlations(directory: str, names: List[str], values: np.ndarray):
+    """Correlates all pairs of columns with every method and writes
+    correlations.csv and correlations.npz to the directory."""
+    os.makedirs(directory, exist_ok=True)
+    results = {
+        method: correlation_matrix(values, method) for method in METHODS
+    }
+    first, second = np.triu_indices(len(names), k=1)
+    path = os.path.join(directory, 'correlations.csv')
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Variable 1', 'Variable 2', 'Method', 'Countries',
+                         'R', 'p-value'])
+        for method, (r, p, n) in results.items():
+            for i, j in zip(first, second):
+                writer.writerow([names[i], names[j], method, n[i, j],
+                                 r[i, j], p[i, j]])
+
+    arrays = {'names': np.array(names)}
+    for method, (r, p, n) in results.items():
+        arrays[f'{method}_r'] = r
+        arrays[f'{method}_p'] = p
+        arrays[f'{method}_n'] = n
+    np.savez(os.path.join(directory, 'correlations.npz'), **arrays)
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else 'correlation_output'
+    minimal_value = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+
+    countries = data_importer.list_countries()
+    variables = consolidator.list_variables(countries[0])
+    latest, final = latest_index.LatestIndex().get_snapshot(
+        variables, minimal_value
+    )
+    indicators, indicator_values = load_indicators(countries)
+    values = np.concatenate(
+        [np.where(np.isnan(latest), final, latest), indicator_values], axis=1
+    )
+
+    write_correlations(directory, variables + indicators, values)
+    print(f'Written to directory [{directory}]')
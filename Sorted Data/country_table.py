@@ -0,0 +1,173 @@
+# Columnar country x variable table, replacing the comma-separated
+# Countries Data File.txt that had to be read, split and rewritten as a whole
+# for every added column. The table is a directory with a JSON manifest
+# (country names and column names) and one float64 .npy file per column, so
+# adding or replacing a column writes only that column and readers load only
+# the columns they ask for. Values that are not present are stored as NaN.
+# Run from the Sorted Data directory to convert to or from the text format:
+#   python country_table.py import [text_file]
+#   python country_table.py export [text_file]
+import data_importer
+import json
+import os
+import sys
+from typing import Iterable, List, Optional
+import numpy as np
+
+# The name of the manifest file inside the table directory.
+MANIFEST = 'table.json'
+
+
+class CountryTable:
+    def __init__(self, directory: str = 'country_table',
+                 countries: Optional[List[str]] = None):
+        self.__directory = directory
+        try:
+            with open(os.path.join(directory, MANIFEST)) as file:
+                manifest = json.load(file)
+            self.__countries = manifest['countries']
+            self.__columns = manifest['columns']
+        except OSError:
+            self.__countries = countries or data_importer.list_countries()
+            self.__columns = []
+
+        if countries is not None and countries != self.__countries:
+            raise ValueError(
+                f'The table in [{directory}] has different countries.'
+            )
+        self.__country_index = {
+            name: i for i, name in enumerate(self.__countries)
+        }
+
+    def __path(self, column: str) -> str:
+        return os.path.join(self.__directory, f'{column}.npy')
+
+    def __save_manifest(self):
+        manifest = json.dumps({
+            'countries': self.__countries,
+            'columns': self.__columns,
+        }, indent=1).encode('utf8')
+        data_importer.write_atomic(
+            os.path.join(self.__directory, MANIFEST),
+            lambda file: file.write(manifest)
+        )
+
+    def get_countries(self) -> List[str]:
+        """Returns the country names, in row order."""
+        return list(self.__countries)
+
+    def get_columns(self) -> List[str]:
+        """Returns the column names, in the order they were added."""
+        return list(self.__columns)
+
+    def has_column(self, column: str) -> bool:
+        """Returns whether the table has a column of the given name."""
+        return column in self.__columns
+
+    def set_column(self, column: str, values: Iterable[Optional[float]]):
+        """Adds a column, or replaces it if it already exists. Only the file
+        of this column and the manifest are written.
+
+        Args:
+            column (str): The column name, usually a variable name.
+            values (Iterable[Optional[float]]): One value per country, in row
+            order, None or NaN where no value is present.
+        """
+        values = np.array(
+            [np.nan if v is None else v for v in values], dtype=np.float64
+        )
+        if len(values) != len(self.__countries):
+            raise ValueError(
+                f'Expected {len(self.__countries)} values for column '
+                f'[{column}], got {len(values)}.'
+            )
+
+        os.makedirs(self.__directory, exist_ok=True)
+        data_importer.write_atomic(
+            self.__path(column),
+            lambda file: np.save(file, values)
+        )
+        if column not in self.__columns:
+            self.__columns.append(column)
+        self.__save_manifest()
+
+    def remove_column(self, column: str):
+        """Removes a column from the table."""
+        self.__columns.remove(column)
+        self.__save_manifest()
+        os.remove(self.__path(column))
+
+    def get_column(self, column: str) -> np.ndarray:
+        """Returns the values of a column, in row order, NaN where no value
+        is present. The column file is memory-mapped, not read.
+        """
+        if column not in self.__columns:
+            raise KeyError(f'The table has no column [{column}].')
+        return np.load(self.__path(column), mmap_mode='r')
+
+    def select(self, columns: List[str],
+               countries: Optional[List[str]] = None) -> np.ndarray:
+        """Returns the (country, column) matrix of the given columns.
+
+        Args:
+            columns (List[str]): The column names.
+            countries (Optional[List[str]]): The country names of the rows,
+            or None for all countries.
+
+        Returns:
+            np.ndarray: The values, NaN where no value is present.
+        """
+        rows = slice(None) if countries is None else \
+            [self.__country_index[name] for name in countries]
+        if len(columns) == 0:
+            return np.empty((len(self.__countries), 0))[rows]
+        return np.stack(
+            [self.get_column(column)[rows] for column in columns], axis=1
+        )
+
+    def export_text(self, filepath: str = 'Countries Data File.txt'):
+        """Writes the table in the comma-separated format of Countries Data
+        File.txt, with None where no value is present."""
+        values = self.select(self.__columns)
+        lines = [', '.join(['Country'] + self.__columns)]
+        for country, row in zip(self.__countries, values):
+            cells = ['None' if np.isnan(v) else str(v) for v in row]
+            lines.append(', '.join([country] + cells))
+        with open(filepath, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+
+    def import_text(self, filepath: str = 'Countries Data File.txt'):
+        """Adds or replaces the columns of a file in the format of Countries
+        Data File.txt. Countries that are not in the table are skipped and
+        unreadable values become NaN."""
+        with open(filepath) as file:
+            lines = [line.split(',') for line in file.read().splitlines()]
+        header = [name.strip() for name in lines[0][1:]]
+        values = np.full((len(self.__countries), len(header)), np.nan)
+        for line in lines[1:]:
+            row = self.__country_index.get(line[0].strip())
+            if row is None:
+                continue
+            for j, cell in enumerate(line[1:len(header) + 1]):
+                try:
+                    values[row, j] = float(cell)
+                except ValueError:
+                    pass
+
+        for j, column in enumerate(header):
+            self.set_column(column, values[:, j])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ('import', 'export'):
+        print('Usage: python country_table.py import|export [text_file]')
+        exit(1)
+
+    target = sys.argv[2] if len(sys.argv) > 2 else 'Countries Data File.txt'
+    table = CountryTable()
+    if sys.argv[1] == 'import':
+        table.import_text(target)
+        print(f'Imported {len(table.get_columns())} columns from [{target}]')
+    else:
+        table.export_text(target)
+        print(f'Written to file [{target}]')
@@ -4,44 +4,70 @@
 # 3. Total casualties
 
 import data_importer
-from typing import Dict, Iterable
+import os
+from typing import Dict, Iterable, Tuple
 import numpy as np
 
+# Variables whose empty-marked records mean 0.0 instead of no change since
+# the previous record.
+ZERO_FILLED = ('excess_mortality',)
+# The date range of interest: January 1st to November 30th, 2021.
+START = (2021, 1, 1)
+STOP = (2021, 11, 30)
+
 
 class Dataset:
-    def __init__(self, country: str):
-        # Create filepaths and import all files.
-        date = data_importer.import_dates(country + '/date.data')
-        population = data_importer.import_time_series(
-            country + '/population.data'
-        )
-        vaccinations = data_importer.import_time_series(
-            country + '/total_vaccinations.data'
-        )
-        cases = data_importer.import_time_series(
-            country + '/total_cases.data'
-        )
-        deaths = data_importer.import_time_series(
-            country + '/total_deaths.data'
-        )
-        excess_mortality = data_importer.import_numerics_handle_none(
-            country + '/excess_mortality.data', 0.0
-        )
+    """The series of a single country, limited to a date range. Any variable
+    of the country directory can be read as an attribute or key, like
+    dataset.new_cases or dataset['new_cases'], and is only decoded on first
+    access. Decoded series live in the process-wide cache of
+    data_importer.import_series instead of in the Dataset, so memory scales
+    with the variables an analysis actually reads.
+    """
+
+    def __init__(self, country: str,
+                 start: Tuple[int, int, int] = START,
+                 stop: Tuple[int, int, int] = STOP):
+        self.__country = country
+        self.__start = start
+        self.__stop = stop
 
-        # Now filter by date to get indices for data slicing.
+    def __range(self) -> slice:
+        # The date axis is decoded once and shared by every variable.
+        dates = data_importer.import_date_axis(self.__country + '/date.data')
         (start, stop) = data_importer.limit_by_date(
-            date,
-            # January 1st, 2021
-            (2021, 1, 1),
-            # November 30th, 2021
-            (2021, 11, 30)
+            dates, self.__start, self.__stop
         )
-        # Convert to Numpy for speed-processing.
-        self.__population = np.array(population[start:stop])
-        self.__vaccinations = np.array(vaccinations[start:stop])
-        self.__cases = np.array(cases[start:stop])
-        self.__deaths = np.array(deaths[start:stop])
-        self.__excessmort = np.array(excess_mortality[start:stop])
+        return slice(start, stop)
+
+    def get_dates(self) -> np.ndarray:
+        """Returns the datetime64[D] dates of the series of this country."""
+        dates = data_importer.import_date_axis(self.__country + '/date.data')
+        return dates[self.__range()]
+
+    def __getitem__(self, variable: str) -> np.ndarray:
+        """Returns the read-only series of the given variable. Empty-marked
+        values are set to the previously known value, or 0.0 for initial
+        values, except for ZERO_FILLED variables, where they are 0.0.
+
+        Raises:
+            KeyError: If the country has no file for the variable.
+        """
+        filepath = f'{self.__country}/{variable}.data'
+        if not os.path.isfile(filepath):
+            raise KeyError(variable)
+        default = 0.0 if variable in ZERO_FILLED else None
+        return data_importer.import_series(filepath, default)[self.__range()]
+
+    def __getattr__(self, variable: str) -> np.ndarray:
+        if variable.startswith('_'):
+            raise AttributeError(variable)
+        try:
+            return self[variable]
+        except KeyError:
+            raise AttributeError(
+                f'No variable {variable} for {self.__country}.'
+            ) from None
 
     def get_population(self) -> Iterable[float]:
         """Returns the population statistics of this country as a Numpy
@@ -50,7 +76,7 @@ class Dataset:
         Returns:
             Iterable[float]: The Numpy array of population data.
         """
-        return self.__population
+        return self['population']
 
     def get_vaccinations(self) -> Iterable[float]:
         """Returns the vaccination statistics of this country as a Numpy
@@ -59,7 +85,7 @@ class Dataset:
         Returns:
             Iterable[float]: The Numpy array of vaccination data.
         """
-        return self.__vaccinations
+        return self['total_vaccinations']
 
     def get_cases(self) -> Iterable[float]:
         """Returns the number-of-covid-cases statistics of this country as
@@ -68,7 +94,7 @@ class Dataset:
         Returns:
             Iterable[float]: The Numpy array of number-of-cases data.
         """
-        return self.__cases
+        return self['total_cases']
 
     def get_deaths(self) -> Iterable[float]:
         """Returns the number-of-deaths statistics of this country as a Numpy
@@ -77,7 +103,7 @@ class Dataset:
         Returns:
             Iterable[float]: The Numpy array of fatality data.
         """
-        return self.__deaths
+        return self['total_deaths']
 
     def get_excess_mortality(self) -> Iterable[float]:
         """Returns the excess mortality statistics of this country as a Numpy
@@ -86,13 +112,13 @@ class Dataset:
         Returns:
             Iterable[float]: The Numpy array of excess mortality.
         """
-        return self.__excessmort
+        return self['excess_mortality']
 
 
 def gather() -> Dict[str, Dataset]:
     """Gathers all of the data for each country and returns a dictionary
     where the key is the country name and the value is the respective
-    dataset.
+    dataset. Series are decoded on first access.
 
     Returns:
         Dict[str, Dataset]: The returned dictionary of country-specific
@@ -100,7 +126,6 @@ def gather() -> Dict[str, Dataset]:
     """
     output = dict()
     for country in data_importer.list_countries():
-        print(f'Parsing data for country [{country}]')
         output[country] = Dataset(country)
 
     return output
@@ -1,6 +1,26 @@
+import json
+import os
+import stat
 import struct
+import tempfile
+from collections import OrderedDict
+import numpy as np
 from typing import List, Tuple, Optional
 
+# Layout of a single numeric record on disk: a one-byte has-value flag
+# directly followed by a little-endian 64-bit float, without padding.
+RECORD_DTYPE = np.dtype([('has', 'u1'), ('val', '<f8')])
+# Layout of a single date record on disk: a one-byte has-value flag, a
+# little-endian 16-bit year, a month byte and a day byte.
+DATE_DTYPE = np.dtype(
+    [('has', 'u1'), ('year', '<u2'), ('month', 'u1'), ('day', 'u1')]
+)
+# Leading bytes of a consolidated cube file, see consolidator.py.
+CUBE_MAGIC = b'SDACUBE1'
+# Upper bound on the bytes of decoded series and date axes kept by
+# import_series and import_date_axis.
+CACHE_BYTES = 2 ** 28
+
 
 def list_countries() -> List[str]:
     """Returns a list of all countries for which data is available.
@@ -19,6 +39,149 @@ def list_countries() -> List[str]:
     return output
 
 
+def decode_dates(filepath: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Reads the given file and decodes the binary data therein as a
+    sequence of dates in one pass.
+
+    Args:
+        filepath (str): The path to the file to read.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The array of dates (datetime64[D]) and
+        the boolean mask of records that hold a date. Empty-marked records
+        are set to NaT.
+    """
+    with open(filepath, 'rb') as file:
+        bytes = file.read()
+
+    # Each date object is 5 bytes; ignore a trailing partial record.
+    segments = len(bytes) // DATE_DTYPE.itemsize
+    records = np.frombuffer(bytes, dtype=DATE_DTYPE, count=segments)
+    mask = records['has'] > 0
+    years = records['year'].astype(np.int64) - 1970
+    months = records['month'].astype(np.int64) - 1
+    days = records['day'].astype(np.int64) - 1
+    dates = (years.astype('datetime64[Y]').astype('datetime64[M]') + months)
+    dates = dates.astype('datetime64[D]') + days
+    dates[~mask] = np.datetime64('NaT')
+    return dates, mask
+
+
+def date_to_datetime64(date) -> np.datetime64:
+    """Converts a (year, month, day) tuple to a datetime64[D] value. Values
+    that already are datetime64 are passed through.
+    """
+    if isinstance(date, np.datetime64):
+        return date.astype('datetime64[D]')
+
+    (y, m, d) = date
+    return np.datetime64(f'{y:04}-{m:02}-{d:02}', 'D')
+
+
+def forward_fill(values: np.ndarray, mask: np.ndarray, default=np.nan,
+                 limit: Optional[int] = None,
+                 backfill: bool = False) -> np.ndarray:
+    """Fills the empty-marked records of one or many series along the last
+    axis, so a single call covers a series, a country's variables or a
+    whole (country, variable, date) cube, see Cube.select.
+
+    Each record takes the value of the last present record at or before it:
+    the running maximum of the indices of present records points at that
+    record, without any per-record Python work.
+
+    Args:
+        values (np.ndarray): The values, of any dtype, series along the last
+        axis.
+        mask (np.ndarray): The boolean mask of present records.
+        default: The value of records that are left empty.
+        limit (Optional[int]): The maximum number of consecutive empty
+        records to fill from one present record, or None for no limit.
+        backfill (bool): Whether records that the forward fill leaves empty,
+        like those before the first present record, take the value of the
+        next present record (within the same limit).
+
+    Returns:
+        np.ndarray: The filled values.
+    """
+    values = np.asarray(values)
+    mask = np.broadcast_to(np.asarray(mask, dtype=bool), values.shape)
+    length = values.shape[-1]
+    positions = np.arange(length)
+
+    index = np.where(mask, positions, -1)
+    np.maximum.accumulate(index, axis=-1, out=index)
+    filled = index >= 0
+    if limit is not None:
+        filled &= positions - index <= limit
+    output = np.where(
+        filled,
+        np.take_along_axis(values, np.maximum(index, 0), axis=-1),
+        default
+    )
+    if not backfill:
+        return output
+
+    # The same, running backwards from the end.
+    following = np.where(mask, positions, length)[..., ::-1]
+    following = np.minimum.accumulate(following, axis=-1)[..., ::-1]
+    back = ~filled & (following < length)
+    if limit is not None:
+        back &= following - positions <= limit
+    return np.where(
+        back,
+        np.take_along_axis(
+            values, np.minimum(following, length - 1), axis=-1
+        ),
+        output
+    )
+
+
+# Decoded series and date axes by kind, path, mtime and default value, least
+# recently used first.
+_cache: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+_cache_bytes = 0
+
+
+def _cached(key: tuple, load) -> np.ndarray:
+    """Returns the cached array of the key, or loads, caches and returns it
+    read-only. The least recently used arrays are dropped once the cache
+    holds more than CACHE_BYTES."""
+    global _cache_bytes
+    array = _cache.get(key)
+    if array is not None:
+        _cache.move_to_end(key)
+        return array
+
+    array = load()
+    array.setflags(write=False)
+    _cache[key] = array
+    _cache_bytes += array.nbytes
+    while _cache_bytes > CACHE_BYTES and len(_cache) > 1:
+        _, dropped = _cache.popitem(last=False)
+        _cache_bytes -= dropped.nbytes
+    return array
+
+
+def import_date_axis(filepath: str) -> np.ndarray:
+    """Reads the given file and decodes the binary data therein as a
+    datetime64[D] date axis. Empty-marked dates are set to the previously
+    known date. The decoded axis is cached like the series of import_series
+    and shared between callers, so it is read-only.
+
+    Args:
+        filepath (str): The path to the file to read.
+
+    Returns:
+        np.ndarray: The read-only array of dates.
+    """
+    def load() -> np.ndarray:
+        dates, mask = decode_dates(filepath)
+        # First date in dataset is February 24th, 2020
+        return forward_fill(dates, mask, np.datetime64('2020-02-24', 'D'))
+
+    return _cached(('dates', filepath, os.path.getmtime(filepath)), load)
+
+
 def import_dates(filepath: str) -> List[Tuple[int, int, int]]:
     """Reads the given file and interprets the binary data therein as a
     sequence of dates.
@@ -30,33 +193,88 @@ def import_dates(filepath: str) -> List[Tuple[int, int, int]]:
         List[Tuple[int, int, int]]: The list of dates read from
         the file.
     """
-    output = []
-    fmt = "xBHBB"
-    # First date in dataset is February 24th, 2020
-    last_known_date = (2020, 2, 24)
     try:
-        with open(filepath, 'rb') as file:
-            bytes = file.read()
-
-            # Each date object is 5 bytes.
-            segments = int(len(bytes) / 5)
-            for segment in range(segments):
-                block_start = segment * 5
-                block_end = block_start + 5
-                has_value, year, month, date = struct.unpack(
-                    fmt,
-                    b'\00' + bytes[block_start:block_end]
-                )
-                if has_value > 0:
-                    last_known_date = (year, month, date)
-
-                output.append(last_known_date)
-
-        return output
-    except ValueError:
+        axis = import_date_axis(filepath)
+    except (OSError, ValueError):
         print(f'[import_dates] Invalid file path: {filepath}.')
         return None
 
+    months = axis.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]').astype(int) + 1970
+    days = (axis - months).astype(int) + 1
+    months = months.astype(int) % 12 + 1
+    return list(zip(years.tolist(), months.tolist(), days.tolist()))
+
+
+def decode_numerics(filepath: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Reads a targeted file and decodes the bytes therein as a sequence of
+    9-byte records in one pass, without any per-record Python work.
+
+    Args:
+        filepath (str): The path to the file to read.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The array of 64-bit floating point
+        values and the boolean mask of records that hold a value. Values of
+        empty-marked records are whatever the file holds, typically 0.0.
+    """
+    with open(filepath, 'rb') as file:
+        bytes = file.read()
+
+    # Each data object is 9 bytes; ignore a trailing partial record.
+    segments = len(bytes) // RECORD_DTYPE.itemsize
+    records = np.frombuffer(bytes, dtype=RECORD_DTYPE, count=segments)
+    # The value field is an unaligned strided view, copy it to be contiguous.
+    values = np.ascontiguousarray(records['val'])
+    mask = records['has'] > 0
+    return values, mask
+
+
+def open_mapped(country: str,
+                variable: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Memory-maps the data file of the given variable for the given country
+    and exposes its records as strided, read-only Numpy views. Nothing is
+    decoded up front: only the pages that are actually indexed are read from
+    disk.
+
+    Args:
+        country (str): The name of the country directory.
+        variable (str): The name of the variable, without .data extension.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The view of the 64-bit floating point
+        values and the view of the has-value flags (non-zero if present).
+    """
+    filepath = f'{country}/{variable}.data'
+    segments = os.path.getsize(filepath) // RECORD_DTYPE.itemsize
+    # Empty files cannot be mapped.
+    if segments == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.uint8)
+
+    records = np.memmap(
+        filepath, dtype=RECORD_DTYPE, mode='r', shape=(segments,)
+    )
+    return records['val'], records['has']
+
+
+def import_tail(country: str, variable: str, window: int = 7,
+                default: float = 0.0) -> np.ndarray:
+    """Returns the last records of the given variable for the given country,
+    touching only the end of the file. Empty-marked values are set to the
+    given default value.
+
+    Args:
+        country (str): The name of the country directory.
+        variable (str): The name of the variable, without .data extension.
+        window (int): The number of trailing records to return.
+        default (float): The value to use for empty-marked records.
+
+    Returns:
+        np.ndarray: The trailing values, oldest first.
+    """
+    values, has = open_mapped(country, variable)
+    return np.where(has[-window:] > 0, values[-window:], default)
+
 
 def import_numerics(filepath: str) -> List[Optional[float]]:
     """Reads a targeted file and interprets the bytes therein as a long list
@@ -69,29 +287,8 @@ def import_numerics(filepath: str) -> List[Optional[float]]:
     Returns:
         List[Optional[float]]: The list of data that was read.
     """
-    output = []
-    # Total size needs to be aligned to 16 bytes.
-    # Data is 9 bytes -> 7 bytes of padding.
-    fmt = "xxxxxxxBd"
-    padding = b'\00\00\00\00\00\00\00'
-    with open(filepath, 'rb') as file:
-        bytes = file.read()
-
-        # Each data object is 9 bytes.
-        segments = int(len(bytes) / 9)
-        for segment in range(segments):
-            block_start = segment * 9
-            block_end = block_start + 9
-            has_value, value = struct.unpack(
-                fmt,
-                padding + bytes[block_start:block_end]
-            )
-            if has_value > 0:
-                output.append(value)
-            else:
-                output.append(None)
-
-    return output
+    values, mask = decode_numerics(filepath)
+    return np.where(mask, values, None).tolist()
 
 
 def import_numerics_handle_none(filepath: str, default: float) -> List[float]:
@@ -105,29 +302,8 @@ def import_numerics_handle_none(filepath: str, default: float) -> List[float]:
     Returns:
         List[float]: The list of data that was read.
     """
-    output = []
-    # Total size needs to be aligned to 16 bytes.
-    # Data is 9 bytes -> 7 bytes of padding.
-    fmt = "xxxxxxxBd"
-    padding = b'\00\00\00\00\00\00\00'
-    with open(filepath, 'rb') as file:
-        bytes = file.read()
-
-        # Each data object is 9 bytes.
-        segments = int(len(bytes) / 9)
-        for segment in range(segments):
-            block_start = segment * 9
-            block_end = block_start + 9
-            has_value, value = struct.unpack(
-                fmt,
-                padding + bytes[block_start:block_end]
-            )
-            if has_value > 0:
-                output.append(value)
-            else:
-                output.append(default)
-
-    return output
+    values, mask = decode_numerics(filepath)
+    return np.where(mask, values, default).tolist()
 
 
 def import_text(filepath) -> List[str]:
@@ -145,15 +321,10 @@ def handle_none_time_series(data: List[Optional[float]]) -> List[float]:
     Returns:
         List[float]: The resulting dataset.
     """
-    last_data = 0.0
-    new_data = list()
-    for sample in data:
-        if sample is not None:
-            last_data = sample
-
-        new_data.append(last_data)
-
-    return new_data
+    samples = np.array(data, dtype=object)
+    mask = np.not_equal(samples, None)
+    values = np.where(mask, samples, 0.0).astype(np.float64)
+    return forward_fill(values, mask, 0.0).tolist()
 
 
 def import_time_series(filepath: str) -> List[float]:
@@ -167,30 +338,35 @@ def import_time_series(filepath: str) -> List[float]:
     Returns:
         List[float]: The time series that was read.
     """
-    output = []
-    # Total size needs to be aligned to 16 bytes.
-    # Data is 9 bytes -> 7 bytes of padding.
-    fmt = "xxxxxxxBd"
-    padding = b'\00\00\00\00\00\00\00'
-    last_value = 0.0
-    with open(filepath, 'rb') as file:
-        bytes = file.read()
+    values, mask = decode_numerics(filepath)
+    return forward_fill(values, mask, 0.0).tolist()
 
-        # Each data object is 9 bytes.
-        segments = int(len(bytes) / 9)
-        for segment in range(segments):
-            block_start = segment * 9
-            block_end = block_start + 9
-            has_value, value = struct.unpack(
-                fmt,
-                padding + bytes[block_start:block_end]
-            )
-            if has_value > 0:
-                last_value = value
 
-            output.append(last_value)
+def import_series(filepath: str,
+                  default: Optional[float] = None) -> np.ndarray:
+    """Reads a targeted file as a series of 64-bit floating point numbers,
+    through a process-wide cache: files are decoded once, until they change
+    on disk, and the least recently used series are dropped when the cache
+    holds more than CACHE_BYTES. The series is shared between callers, so it
+    is read-only.
 
-    return output
+    Args:
+        filepath (str): The path to the file to read.
+        default (Optional[float]): The value of empty-marked records, or None
+        to set them to the previously known value, or 0.0 for initial values,
+        as import_time_series does.
+
+    Returns:
+        np.ndarray: The read-only series.
+    """
+    def load() -> np.ndarray:
+        values, mask = decode_numerics(filepath)
+        if default is None:
+            return forward_fill(values, mask, 0.0)
+        return np.where(mask, values, default)
+
+    key = ('series', filepath, os.path.getmtime(filepath), default)
+    return _cached(key, load)
 
 
 def import_final(filepath: str) -> Optional[float]:
@@ -206,27 +382,122 @@ def import_final(filepath: str) -> Optional[float]:
         Optional[float]: The final value that was read, or None if no data is
         in the set.
     """
-    # Total size needs to be aligned to 16 bytes.
-    # Data is 9 bytes -> 7 bytes of padding.
-    fmt = "xxxxxxxBd"
-    padding = b'\00\00\00\00\00\00\00'
-    last_value = None
-    with open(filepath, 'rb') as file:
-        bytes = file.read()
+    values, mask = decode_numerics(filepath)
+    valid = np.flatnonzero(mask)
+    if len(valid) == 0:
+        return None
 
-        # Each data object is 9 bytes.
-        segments = int(len(bytes) / 9)
-        for segment in range(segments):
-            block_start = segment * 9
-            block_end = block_start + 9
-            has_value, value = struct.unpack(
-                fmt,
-                padding + bytes[block_start:block_end]
-            )
-            if has_value > 0:
-                last_value = value
+    return float(values[valid[-1]])
 
-    return last_value
+
+def numeric_records(values: np.ndarray,
+                    mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """Packs values and a validity mask into 9-byte numeric records.
+
+    Args:
+        values (np.ndarray): The values, of any shape.
+        mask (Optional[np.ndarray]): The boolean mask of values that are
+        present, or None to treat every value that is not NaN as present.
+
+    Returns:
+        np.ndarray: The records, shaped like the values. Empty-marked
+        records hold 0.0, as the files written by DataSplitter do.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    mask = ~np.isnan(values) if mask is None else np.asarray(mask, bool)
+    records = np.zeros(values.shape, dtype=RECORD_DTYPE)
+    records['has'] = mask
+    records['val'] = np.where(mask, values, 0.0)
+    return records
+
+
+def date_records(dates, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """Packs dates and a validity mask into 5-byte date records.
+
+    Args:
+        dates: The datetime64 dates, or a list of (year, month, day) tuples.
+        mask (Optional[np.ndarray]): The boolean mask of dates that are
+        present, or None to treat every date that is not NaT as present.
+
+    Returns:
+        np.ndarray: The records. Empty-marked records are all zeros.
+    """
+    if not isinstance(dates, np.ndarray):
+        dates = [date_to_datetime64(date) for date in dates]
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    mask = ~np.isnat(dates) if mask is None else np.asarray(mask, bool)
+    months = dates.astype('datetime64[M]')
+    records = np.zeros(dates.shape, dtype=DATE_DTYPE)
+    records['has'] = mask
+    records['year'] = np.where(
+        mask, months.astype('datetime64[Y]').astype(np.int64) + 1970, 0
+    )
+    records['month'] = np.where(mask, months.astype(np.int64) % 12 + 1, 0)
+    records['day'] = np.where(mask, (dates - months).astype(np.int64) + 1, 0)
+    return records
+
+
+def write_atomic(filepath: str, write) -> None:
+    """Writes a file through a temporary file in the same directory that
+    replaces it when done, so readers never see a partially written file.
+    The temporary file has a unique name, so concurrent writers do not
+    collide, and it is removed if writing fails.
+
+    Args:
+        filepath (str): The path of the file to write.
+        write: A function that writes the contents to the open binary file.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(filepath).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    file = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(filepath) or '.',
+        prefix=os.path.basename(filepath) + '.', suffix='.tmp', delete=False
+    )
+    try:
+        with file:
+            write(file)
+        # Temporary files are private to their owner, the target need not be.
+        os.chmod(file.name, mode)
+        os.replace(file.name, filepath)
+    except BaseException:
+        os.remove(file.name)
+        raise
+
+
+def export_numerics(filepath: str, values: np.ndarray,
+                    mask: Optional[np.ndarray] = None) -> None:
+    """Writes a series of 64-bit floating point numbers to a targeted file
+    in the format read by decode_numerics, replacing the file atomically.
+
+    Args:
+        filepath (str): The path to the file to write.
+        values (np.ndarray): The values of the series.
+        mask (Optional[np.ndarray]): The boolean mask of values that are
+        present, or None to treat every value that is not NaN as present.
+    """
+    if mask is not None:
+        mask = np.ravel(mask)
+    records = numeric_records(np.ravel(values), mask)
+    write_atomic(filepath, lambda file: file.write(records.tobytes()))
+
+
+def export_dates(filepath: str, dates,
+                 mask: Optional[np.ndarray] = None) -> None:
+    """Writes a sequence of dates to a targeted file in the format read by
+    decode_dates, replacing the file atomically.
+
+    Args:
+        filepath (str): The path to the file to write.
+        dates: The datetime64 dates, or a list of (year, month, day) tuples.
+        mask (Optional[np.ndarray]): The boolean mask of dates that are
+        present, or None to treat every date that is not NaT as present.
+    """
+    records = date_records(dates, mask)
+    write_atomic(filepath, lambda file: file.write(records.tobytes()))
 
 
 def date_equal(a: Tuple[int, int, int], b: Tuple[int, int, int]) -> bool:
@@ -235,32 +506,129 @@ def date_equal(a: Tuple[int, int, int], b: Tuple[int, int, int]) -> bool:
         a[0] == b[0] and a[1] == b[1] and a[2] == b[2]
 
 
-def limit_by_date(dates: List[Tuple[int, int, int]],
-                  start: Tuple[int, int, int],
-                  stop: Tuple[int, int, int]) -> Tuple[int, int]:
-    """Given a list of dates, and a start and end date, returns a tuple of
-    indices to slice by to limit datasets to the given range of dates.
+def limit_by_date(dates, start, stop) -> Tuple[int, int]:
+    """Given a sorted date axis, and a start and end date, returns a tuple of
+    indices to slice by to limit datasets to the given range of dates. Bounds
+    that are not in the axis resolve to the nearest date within the range.
 
     Args:
-        dates (List[Tuple[int, int, int]]): The list of dates.
+        dates (np.ndarray): The datetime64[D] date axis, see
+        import_date_axis. A list of (year, month, day) tuples is converted
+        first, which costs a pass over the list.
         start (Tuple[int, int, int]): The starting date (inclusive).
         stop (Tuple[int, int, int]): The stopping date (inclusive).
 
     Returns:
         Tuple[int, int]: The tuple of indices.
     """
-    out_start = 0
-    out_end = len(dates) - 1
-    for i in range(out_end + 1):
-        date = dates[i]
-        if date_equal(date, start):
-            out_start = i
-        if date_equal(date, stop):
-            out_end = i
+    if not isinstance(dates, np.ndarray):
+        dates = np.array([date_to_datetime64(date) for date in dates])
 
+    # Binary search: first date on or after start, last on or before stop.
+    out_start = int(dates.searchsorted(date_to_datetime64(start), 'left'))
+    out_end = int(dates.searchsorted(date_to_datetime64(stop), 'right')) - 1
     return (out_start, out_end)
 
 
+class Cube:
+    """A read-only, memory-mapped view of the consolidated country x variable
+    x date cube written by consolidator.py. Values are 64-bit floats (NaN
+    where no value is present) and validity is kept in a packed bitmask, so
+    opening the cube costs one mmap instead of a file open per series.
+    """
+
+    def __init__(self, filepath: str = 'data_cube.bin'):
+        with open(filepath, 'rb') as file:
+            if file.read(len(CUBE_MAGIC)) != CUBE_MAGIC:
+                raise ValueError(f'[Cube] Not a data cube: {filepath}.')
+            (length,) = struct.unpack('<Q', file.read(8))
+            header = json.loads(file.read(length).decode('utf8'))
+
+        self.__countries = header['countries']
+        self.__variables = header['variables']
+        self.__country_index = {
+            name: i for i, name in enumerate(self.__countries)
+        }
+        self.__variable_index = {
+            name: i for i, name in enumerate(self.__variables)
+        }
+        num_dates = header['dates']
+        self.__start = np.datetime64(header['start'], 'D')
+        self.__dates = self.__start + np.arange(num_dates)
+
+        shape = (len(self.__countries), len(self.__variables), num_dates)
+        offset = len(CUBE_MAGIC) + 8 + length
+        self.__values = np.memmap(
+            filepath, dtype='<f8', mode='r', offset=offset, shape=shape
+        )
+        self.__bits = np.memmap(
+            filepath, dtype=np.uint8, mode='r',
+            offset=offset + self.__values.nbytes,
+            shape=shape[:2] + ((num_dates + 7) // 8,)
+        )
+
+    def get_countries(self) -> List[str]:
+        """Returns the country names along the first axis of the cube."""
+        return list(self.__countries)
+
+    def get_variables(self) -> List[str]:
+        """Returns the variable names along the second axis of the cube."""
+        return list(self.__variables)
+
+    def get_dates(self) -> np.ndarray:
+        """Returns the daily date axis (datetime64[D]) of the cube."""
+        return self.__dates
+
+    def __selector(self, index, names):
+        # A single name keeps its axis and stays a view, lists copy.
+        if names is None:
+            return slice(None)
+        if isinstance(names, str):
+            i = index[names]
+            return slice(i, i + 1)
+        return np.array([index[name] for name in names], dtype=np.intp)
+
+    def __date_index(self, date, default: int) -> int:
+        if date is None:
+            return default
+        return int((date_to_datetime64(date) - self.__start).astype(int))
+
+    def select(self, countries=None, variables=None,
+               start: Optional[Tuple[int, int, int]] = None,
+               stop: Optional[Tuple[int, int, int]] = None
+               ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns a slice of the cube by country, variable and date range.
+
+        Args:
+            countries: A country name, a list of names, or None for all.
+            variables: A variable name, a list of names, or None for all.
+            start (Tuple[int, int, int]): The starting date (inclusive), or
+            None to start at the first date.
+            stop (Tuple[int, int, int]): The stopping date (inclusive), or
+            None to stop at the last date.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The values and the boolean
+            validity mask, both shaped (countries, variables, dates).
+        """
+        c = self.__selector(self.__country_index, countries)
+        v = self.__selector(self.__variable_index, variables)
+        num_dates = len(self.__dates)
+        a = min(max(self.__date_index(start, 0), 0), num_dates)
+        b = min(max(self.__date_index(stop, num_dates - 1) + 1, a), num_dates)
+        values = self.__values[..., a:b][c][:, v]
+        # Unpack only the bytes covering the date range, then trim.
+        bits = self.__bits[..., a // 8:(b + 7) // 8][c][:, v]
+        mask = np.unpackbits(bits, axis=-1)[..., a % 8:a % 8 + (b - a)]
+        return values, mask.astype(bool)
+
+    def get_series(self, country: str,
+                   variable: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the values and validity mask of a single series."""
+        values, mask = self.select(country, variable)
+        return values[0, 0], mask[0, 0]
+
+
 # Demo of usage.
 if __name__ == "__main__":
     dates = import_dates('Netherlands/date.data')
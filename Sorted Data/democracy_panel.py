@@ -0,0 +1,144 @@
+# Country x year panel of the democracy index scores of democracy_index.txt
+# (a long name/time/DI table), with country names converted to those of
+# countries.txt through ALIASES and binder.txt. The text file is parsed only
+# once: the panel is cached in a binary .npz file that is rebuilt when
+# democracy_index.txt, binder.txt or ALIASES change. Run from the Sorted Data
+# directory to build the cache:
+#   python democracy_panel.py
+import data_importer
+import os
+from typing import List, Optional, Tuple, Union
+import numpy as np
+
+# A single year, or an inclusive (first, last) range of years.
+Years = Union[int, Tuple[int, int]]
+# Names of democracy_index.txt that binder.txt does not cover, with their
+# names in countries.txt.
+ALIASES = {
+    'Congo, Dem. Rep.': 'Democratic Republic of Congo',
+    'Congo, Rep.': 'Congo',
+    'Hong Kong, China': 'Hong Kong',
+    'Lao': 'Laos',
+    'Macedonia, FYR': 'North Macedonia',
+}
+
+
+def _parse(filepath: str, binder_path: str) -> Tuple[List[str], np.ndarray,
+                                                     np.ndarray]:
+    """Parses the long-format text file into names, years and the (country,
+    year) score matrix, NaN where a country has no score."""
+    binder = dict()
+    with open(binder_path, 'r') as file:
+        for line in file.readlines():
+            parts = line.split(':')
+            if len(parts) == 2:
+                binder[parts[0].strip()] = parts[1].strip()
+    binder.update(ALIASES)
+
+    with open(filepath) as file:
+        rows = [line.split('\t') for line in file.read().splitlines()[1:]]
+    names = list(dict.fromkeys(row[0] for row in rows))
+    # Renamed countries do not replace countries listed under that name.
+    renamed = {
+        name: binder[name] if name in binder and binder[name] not in names
+        else name for name in names
+    }
+    countries = list(dict.fromkeys(renamed.values()))
+    country_index = {name: i for i, name in enumerate(countries)}
+
+    times = np.array([int(row[1]) for row in rows])
+    years = np.arange(times.min(), times.max() + 1)
+    scores = np.full((len(countries), len(years)), np.nan)
+    for row, time in zip(rows, times):
+        try:
+            score = float(row[2])
+        except ValueError:
+            continue
+        scores[country_index[renamed[row[0]]], time - years[0]] = score
+
+    return countries, years, scores
+
+
+class DemocracyPanel:
+    def __init__(self, filepath: str = 'democracy_index.txt',
+                 cache: str = 'democracy_index.npz',
+                 binder: str = 'binder.txt'):
+        sources = np.array([os.path.getmtime(filepath),
+                            os.path.getmtime(binder)])
+        aliases = np.array(sorted(ALIASES.items()))
+        try:
+            stored = np.load(cache)
+            if not np.array_equal(stored['sources'], sources) or \
+                    not np.array_equal(stored['aliases'], aliases):
+                raise ValueError('The cache is out of date.')
+            countries = stored['countries'].tolist()
+            years = stored['years']
+            scores = stored['scores']
+        except (OSError, KeyError, ValueError):
+            countries, years, scores = _parse(filepath, binder)
+            data_importer.write_atomic(cache, lambda file: np.savez(
+                file, sources=sources, countries=np.array(countries),
+                years=years, scores=scores, aliases=aliases
+            ))
+
+        self.__countries = countries
+        self.__years = years
+        self.__scores = scores
+        self.__country_index = {name: i for i, name in enumerate(countries)}
+
+    def get_countries(self) -> List[str]:
+        """Returns the country names of the panel rows."""
+        return list(self.__countries)
+
+    def get_years(self) -> np.ndarray:
+        """Returns the years of the panel columns."""
+        return self.__years.copy()
+
+    def __columns(self, years: Years) -> slice:
+        first, last = (years, years) if isinstance(years, int) else years
+        if first < self.__years[0] or last > self.__years[-1] or first > last:
+            raise ValueError(
+                f'The democracy index covers {self.__years[0]} to '
+                f'{self.__years[-1]}, not {first} to {last}.'
+            )
+        return slice(first - self.__years[0], last - self.__years[0] + 1)
+
+    def select(self, countries: Optional[List[str]] = None,
+               years: Optional[Years] = None) -> np.ndarray:
+        """Returns the (country, year) matrix of scores.
+
+        Args:
+            countries (Optional[List[str]]): The country names of the rows,
+            or None for all countries of the panel. Countries without any
+            score get a row of NaN.
+            years (Optional[Years]): A year or an inclusive range of years,
+            or None for all years.
+
+        Returns:
+            np.ndarray: The scores, NaN where a country has none.
+        """
+        columns = slice(None) if years is None else self.__columns(years)
+        if countries is None:
+            return self.__scores[:, columns].copy()
+
+        rows = np.array([self.__country_index.get(c, -1) for c in countries])
+        # An extra row of NaN serves the countries that are not in the panel.
+        missing = np.full((1, len(self.__years)), np.nan)[:, columns]
+        padded = np.vstack((self.__scores[:, columns], missing))
+        return padded[rows]
+
+    def get_scores(self, countries: List[str], years: Years) -> np.ndarray:
+        """Returns the score of every country in a year, or its mean score
+        over a range of years, NaN if it has no score in that period."""
+        scores = self.select(countries, years)
+        present = ~np.isnan(scores)
+        total = np.where(present, scores, 0.0).sum(axis=1)
+        counts = present.sum(axis=1)
+        return np.where(counts > 0, total / np.maximum(counts, 1), np.nan)
+
+
+if __name__ == "__main__":
+    panel = DemocracyPanel()
+    years = panel.get_years()
+    print(f'Indexed {len(panel.get_countries())} countries from '
+          f'{years[0]} to {years[-1]}.')
@@ -0,0 +1,194 @@
+# Persistent sidecar index of the latest values of every variable for every
+# country, so that snapshot queries (the latest value above a cut-off within
+# the final seven records, or the final value of a series) become table
+# lookups instead of file decodes. An entry is only recomputed when the
+# modification time of its .data file changes. Run from the Sorted Data
+# directory to build or refresh the index:
+#   python latest_index.py
+import consolidator
+import data_importer
+import os
+from typing import List, Optional, Tuple
+import numpy as np
+
+# The number of trailing records kept per series.
+WINDOW = 7
+
+
+class LatestIndex:
+    def __init__(self, filepath: str = 'latest_index.npz'):
+        self.__filepath = filepath
+        self.__countries = data_importer.list_countries()
+        self.__variables = consolidator.list_variables(self.__countries[0])
+        self.__country_index = {
+            name: i for i, name in enumerate(self.__countries)
+        }
+        self.__variable_index = {
+            name: i for i, name in enumerate(self.__variables)
+        }
+
+        shape = (len(self.__countries), len(self.__variables))
+        # NaN modification times force every entry to be computed.
+        self.__mtimes = np.full(shape, np.nan)
+        self.__last_valid = np.full(shape, np.nan)
+        self.__last_valid_index = np.full(shape, -1, dtype=np.int64)
+        self.__latest_positive = np.full(shape, np.nan)
+        # Trailing records, empty-marked ones set to 0.0, NaN-padded in front
+        # for series shorter than the window.
+        self.__tails = np.full(shape + (WINDOW,), np.nan)
+        try:
+            stored = np.load(filepath)
+            if stored['countries'].tolist() == self.__countries and \
+                    stored['variables'].tolist() == self.__variables:
+                self.__mtimes = stored['mtimes']
+                self.__last_valid = stored['last_valid']
+                self.__last_valid_index = stored['last_valid_index']
+                self.__latest_positive = stored['latest_positive']
+                self.__tails = stored['tails']
+        except (OSError, KeyError, ValueError):
+            pass
+
+        self.refresh()
+
+    def __update(self, i: int, j: int, filepath: Optional[str]):
+        self.__last_valid[i, j] = np.nan
+        self.__last_valid_index[i, j] = -1
+        self.__latest_positive[i, j] = np.nan
+        self.__tails[i, j] = np.nan
+        if filepath is None:
+            return
+
+        values, mask = data_importer.decode_numerics(filepath)
+        valid = np.flatnonzero(mask)
+        if len(valid) > 0:
+            self.__last_valid[i, j] = values[valid[-1]]
+            self.__last_valid_index[i, j] = valid[-1]
+
+        tail = np.where(mask[-WINDOW:], values[-WINDOW:], 0.0)
+        if len(tail) > 0:
+            self.__tails[i, j, WINDOW - len(tail):] = tail
+        positive = np.flatnonzero(tail > 0.0)
+        if len(positive) > 0:
+            self.__latest_positive[i, j] = tail[positive[-1]]
+
+    def refresh(self) -> int:
+        """Recomputes the entries whose .data file changed since they were
+        last indexed, and stores the index if anything changed.
+
+        Returns:
+            int: The number of recomputed entries.
+        """
+        updated = 0
+        for i, country in enumerate(self.__countries):
+            for j, variable in enumerate(self.__variables):
+                filepath = f'{country}/{variable}.data'
+                try:
+                    mtime = os.path.getmtime(filepath)
+                except OSError:
+                    # Missing files are indexed as empty series.
+                    mtime = -1.0
+                if mtime == self.__mtimes[i, j]:
+                    continue
+
+                self.__update(i, j, filepath if mtime >= 0 else None)
+                self.__mtimes[i, j] = mtime
+                updated += 1
+
+        if updated > 0:
+            self.save()
+
+        return updated
+
+    def save(self):
+        """Writes the index to its file, replacing it atomically."""
+        data_importer.write_atomic(self.__filepath, lambda file: np.savez(
+            file,
+            countries=np.array(self.__countries),
+            variables=np.array(self.__variables),
+            mtimes=self.__mtimes,
+            last_valid=self.__last_valid,
+            last_valid_index=self.__last_valid_index,
+            latest_positive=self.__latest_positive,
+            tails=self.__tails
+        ))
+
+    def __entry(self, country: str, variable: str) -> Tuple[int, int]:
+        return self.__country_index[country], self.__variable_index[variable]
+
+    def has_entry(self, country: str, variable: str) -> bool:
+        """Returns whether the index holds the series of the given country
+        and variable."""
+        return country in self.__country_index and \
+            variable in self.__variable_index
+
+    def get_countries(self) -> List[str]:
+        """Returns the indexed country names."""
+        return list(self.__countries)
+
+    def get_variables(self) -> List[str]:
+        """Returns the indexed variable names."""
+        return list(self.__variables)
+
+    def get_latest(self, country: str, variable: str,
+                   minimal_value: float = 0.0) -> Optional[float]:
+        """Returns the latest value larger than minimal_value within the
+        final seven records of a series, with empty-marked records counting
+        as 0.0, or None if there is no such value.
+        """
+        i, j = self.__entry(country, variable)
+        if minimal_value == 0.0:
+            value = self.__latest_positive[i, j]
+            return None if np.isnan(value) else float(value)
+
+        tail = self.__tails[i, j]
+        above = np.flatnonzero(tail > minimal_value)
+        return float(tail[above[-1]]) if len(above) > 0 else None
+
+    def get_final(self, country: str, variable: str) -> Optional[float]:
+        """Returns the final record of a series, 0.0 if it is empty-marked,
+        or None if the series has no records.
+        """
+        i, j = self.__entry(country, variable)
+        value = self.__tails[i, j, -1]
+        return None if np.isnan(value) else float(value)
+
+    def get_last_valid(self, country: str,
+                       variable: str) -> Tuple[Optional[float], int]:
+        """Returns the last value that is present anywhere in a series, like
+        data_importer.import_final, and its index on the date axis of the
+        country, or (None, -1) if no value is present.
+        """
+        i, j = self.__entry(country, variable)
+        value = self.__last_valid[i, j]
+        index = int(self.__last_valid_index[i, j])
+        return (None if np.isnan(value) else float(value)), index
+
+    def get_tails(self, variables: List[str]) -> np.ndarray:
+        """Returns the (country, variable, record) array of the final seven
+        records of the given variables, see get_latest.
+        """
+        return self.__tails[:, [self.__variable_index[v] for v in variables]]
+
+    def get_snapshot(self, variables: List[str], minimal_value: float = 0.0
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the latest values of the given variables for every country
+        at once, see get_latest and get_final.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The (country, variable) matrix of
+            the latest values, NaN if none is larger than minimal_value, and
+            the matrix of the final values, NaN for series without records.
+        """
+        tails = self.get_tails(variables)
+        above = tails > minimal_value
+        # Position of the last record above the cut-off in each window.
+        last = WINDOW - 1 - np.argmax(above[..., ::-1], axis=-1)
+        latest = np.take_along_axis(tails, last[..., np.newaxis], axis=-1)
+        latest = np.where(above.any(axis=-1), latest[..., 0], np.nan)
+        return latest, tails[..., -1]
+
+
+if __name__ == "__main__":
+    index = LatestIndex()
+    print(f'Indexed {len(index.get_countries())} countries and '
+          f'{len(index.get_variables())} variables.')
@@ -0,0 +1,301 @@
+# Splits the Our World in Data covid-19 CSV export into the per-country .data
+# files that data_importer reads, like the DataSplitter project of
+# CSV_Data_Processor but without .NET. The CSV is streamed in chunks of rows
+# that are parsed column-wise with Numpy, and every chunk is appended to the
+# files of the countries it holds, so memory stays bounded for any file size
+# and only one output file is open at a time. The output matches the files
+# written by DataSplitter byte for byte. The update mode only appends the days
+# that are newer than the files of each country. Run from the Sorted Data
+# directory:
+#   python owid_ingester.py [ingest|update] [csv_file] [output_directory]
+import data_importer
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+# Leading text columns of the export; location names the country directory.
+KEY_COLUMNS = ('iso_code', 'continent', 'location')
+DATE_COLUMN = 'date'
+# Text columns, written as one line per record.
+TEXT_COLUMNS = ('tests_units',)
+# Number of CSV rows parsed at once.
+CHUNK_ROWS = 2 ** 14
+
+
+def _chunks(file, columns: int) -> Iterator[np.ndarray]:
+    """Yields the rows of an open CSV file as (row, column) string arrays of
+    at most CHUNK_ROWS rows. Missing trailing fields are empty."""
+    rows = []
+    for line in file:
+        parts = line.rstrip('\r\n').split(',')
+        if len(parts) < columns:
+            parts += [''] * (columns - len(parts))
+        rows.append(parts[:columns])
+        if len(rows) == CHUNK_ROWS:
+            yield np.array(rows)
+            rows = []
+    if rows:
+        yield np.array(rows)
+
+
+def _parse_floats(fields: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Parses an array of strings as floats. Empty or malformed fields are
+    marked as missing with value 0.0, as DataSplitter does."""
+    fields = np.char.strip(fields)
+    mask = fields != ''
+    values = np.zeros(fields.shape)
+    try:
+        values[mask] = fields[mask].astype(np.float64)
+    except ValueError:
+        # Rare malformed fields: fall back to parsing one at a time.
+        for index in zip(*np.nonzero(mask)):
+            try:
+                values[index] = float(fields[index])
+            except ValueError:
+                mask[index] = False
+    return values, mask
+
+
+def encode_numerics(fields: np.ndarray) -> np.ndarray:
+    """Encodes a (row, column) string array as numeric records, transposed
+    to (column, row) so the records of a column are contiguous."""
+    values, mask = _parse_floats(fields)
+    return data_importer.numeric_records(values.T, mask.T)
+
+
+def parse_dates(fields: np.ndarray) -> np.ndarray:
+    """Parses an array of YYYY-MM-DD strings as datetime64[D] dates. Empty or
+    malformed dates are NaT."""
+    fields = np.char.strip(fields)
+    try:
+        return fields.astype('datetime64[D]')
+    except ValueError:
+        dates = np.full(len(fields), np.datetime64('NaT'), 'datetime64[D]')
+        for i, field in enumerate(fields):
+            try:
+                dates[i] = np.datetime64(field, 'D')
+            except ValueError:
+                pass
+        return dates
+
+
+def encode_text(fields: np.ndarray) -> bytes:
+    """Encodes an array of strings as lines of UTF-8 text. Blank fields
+    become empty lines."""
+    return ''.join(
+        (field if field.strip() else '') + '\n' for field in fields
+    ).encode('utf8')
+
+
+class _Chunk:
+    """The encoded records of a chunk of CSV rows, grouped by location."""
+
+    def __init__(self, rows: np.ndarray, header: List[str]):
+        location = header.index(KEY_COLUMNS[2])
+        date = header.index(DATE_COLUMN)
+        self.__text = [
+            (name, rows[:, i]) for i, name in enumerate(header)
+            if name in TEXT_COLUMNS
+        ]
+        numeric = [
+            i for i, name in enumerate(header)
+            if name not in KEY_COLUMNS and name != DATE_COLUMN
+            and name not in TEXT_COLUMNS
+        ]
+        self.dates = parse_dates(rows[:, date])
+        self.__encoded = [
+            (DATE_COLUMN, data_importer.date_records(self.dates))
+        ]
+        numerics = encode_numerics(rows[:, numeric])
+        self.__encoded += [
+            (header[i], numerics[j]) for j, i in enumerate(numeric)
+        ]
+        # The rows of a location are usually consecutive, but need not be.
+        locations = rows[:, location]
+        self.locations = {
+            name: np.flatnonzero(locations == name)
+            for name in dict.fromkeys(locations.tolist())
+        }
+
+    def get_files(self, selection: np.ndarray) -> Dict[str, bytes]:
+        """Returns the bytes of the selected rows per file name."""
+        files = {
+            column + '.data': records[selection].tobytes()
+            for column, records in self.__encoded
+        }
+        for column, fields in self.__text:
+            files[column + '.data'] = encode_text(fields[selection])
+        return files
+
+
+def _read(filepath: str) -> Iterator[_Chunk]:
+    """Yields the chunks of the CSV file."""
+    with open(filepath, 'r', encoding='utf-8-sig', newline='') as file:
+        header = [name.strip() for name in file.readline().split(',')]
+        for rows in _chunks(file, len(header)):
+            yield _Chunk(rows, header)
+
+
+def ingest(filepath: str = 'owid-covid-data.csv',
+           directory: str = '.') -> List[str]:
+    """Writes the .data files of every location in the CSV file, replacing
+    the files of those locations.
+
+    Args:
+        filepath (str): The path of the OWID CSV export.
+        directory (str): The directory to create the country directories in.
+
+    Returns:
+        List[str]: The locations that were written, in order of appearance.
+    """
+    written: List[str] = []
+    started = set()
+    for chunk in _read(filepath):
+        for name, selection in chunk.locations.items():
+            country_dir = os.path.join(directory, name)
+            # The first rows of a location replace its old files.
+            mode = 'ab' if name in started else 'wb'
+            if mode == 'wb':
+                os.makedirs(country_dir, exist_ok=True)
+                started.add(name)
+                written.append(name)
+            for filename, data in chunk.get_files(selection).items():
+                with open(os.path.join(country_dir, filename), mode) as output:
+                    output.write(data)
+
+    return written
+
+
+def _record_size(filename: str) -> int:
+    """Returns the size of a record of the given file, 0 for text files."""
+    if filename == DATE_COLUMN + '.data':
+        return data_importer.DATE_DTYPE.itemsize
+    if filename[:-5] in TEXT_COLUMNS:
+        return 0
+    return data_importer.RECORD_DTYPE.itemsize
+
+
+def _high_water_mark(country_dir: str) -> Tuple[int, Optional[np.datetime64]]:
+    """Returns the number of complete date records of a country directory
+    and its last date, or None if it has no dates."""
+    filepath = os.path.join(country_dir, DATE_COLUMN + '.data')
+    if not os.path.isfile(filepath):
+        return 0, None
+    dates, mask = data_importer.decode_dates(filepath)
+    return len(dates), dates[mask].max() if mask.any() else None
+
+
+def _align(country_dir: str, count: int, filenames: List[str]) -> List[str]:
+    """Brings every file of a country directory to exactly count records:
+    records past date.data, left by an interrupted update, are cut off, and
+    files that are missing or short (new variables) are padded with empty
+    records.
+
+    Returns:
+        List[str]: The names of all .data files of the directory.
+    """
+    existing = [name for name in os.listdir(country_dir)
+                if name.endswith('.data')]
+    for filename in dict.fromkeys(existing + filenames):
+        filepath = os.path.join(country_dir, filename)
+        size = _record_size(filename)
+        if size == 0:
+            lines = []
+            if os.path.isfile(filepath):
+                with open(filepath, 'rb') as file:
+                    lines = file.read().split(b'\n')[:-1][:count]
+            data = b''.join(line + b'\n' for line in lines)
+            data += b'\n' * (count - len(lines))
+            if not os.path.isfile(filepath) or \
+                    os.path.getsize(filepath) != len(data):
+                with open(filepath, 'wb') as file:
+                    file.write(data)
+            continue
+
+        length = os.path.getsize(filepath) if os.path.isfile(filepath) else 0
+        if length > count * size:
+            os.truncate(filepath, count * size)
+        elif length < count * size:
+            with open(filepath, 'ab') as file:
+                file.truncate(length - length % size)
+                file.write(bytes(count * size - length + length % size))
+    return list(dict.fromkeys(existing + filenames))
+
+
+def update(filepath: str = 'owid-covid-data.csv',
+           directory: str = '.') -> Dict[str, int]:
+    """Appends the days of the CSV file that are newer than the last date of
+    each location to its .data files, instead of rewriting every file.
+
+    The last date in date.data is the high-water mark of a location: rows up
+    to it are skipped, so locations without new days are not touched at all.
+    Values that the export revised for days before the mark are not picked
+    up; use ingest for a full refresh. Every file of a location gets the same
+    records appended, empty for columns the export lacks, and date.data is
+    appended last. An interrupted update therefore leaves at most records
+    past the end of date.data, which the next update cuts off before
+    appending, so the files never disagree about the days they hold.
+
+    Args:
+        filepath (str): The path of the OWID CSV export.
+        directory (str): The directory of the country directories.
+
+    Returns:
+        Dict[str, int]: The number of days appended per location.
+    """
+    marks: Dict[str, Tuple[int, Optional[np.datetime64]]] = {}
+    appended: Dict[str, int] = {}
+    targets: Dict[str, List[str]] = {}
+    date_file = DATE_COLUMN + '.data'
+    for chunk in _read(filepath):
+        for name, selection in chunk.locations.items():
+            country_dir = os.path.join(directory, name)
+            if name not in marks:
+                os.makedirs(country_dir, exist_ok=True)
+                marks[name] = _high_water_mark(country_dir)
+            count, mark = marks[name]
+            dates = chunk.dates[selection]
+            new = ~np.isnat(dates)
+            if mark is not None:
+                new &= dates > mark
+            selection = selection[new]
+            if len(selection) == 0:
+                continue
+
+            files = chunk.get_files(selection)
+            if name not in targets:
+                targets[name] = _align(country_dir, count, list(files))
+                appended[name] = 0
+            for filename in targets[name]:
+                if filename == date_file:
+                    continue
+                data = files.get(filename)
+                if data is None:
+                    size = _record_size(filename)
+                    data = bytes(len(selection) * size) if size else \
+                        b'\n' * len(selection)
+                with open(os.path.join(country_dir, filename), 'ab') as file:
+                    file.write(data)
+            with open(os.path.join(country_dir, date_file), 'ab') as file:
+                file.write(files[date_file])
+            marks[name] = (count + len(selection), dates[new].max())
+            appended[name] += len(selection)
+
+    return appended
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'ingest'
+    filepath = sys.argv[2] if len(sys.argv) > 2 else 'owid-covid-data.csv'
+    directory = sys.argv[3] if len(sys.argv) > 3 else '.'
+    if mode == 'ingest':
+        locations = ingest(filepath, directory)
+        print(f'Wrote the data of {len(locations)} locations to {directory}.')
+    elif mode == 'update':
+        appended = update(filepath, directory)
+        print(f'Appended {sum(appended.values())} days to '
+              f'{len(appended)} locations in {directory}.')
+    else:
+        print('Usage: python owid_ingester.py [ingest|update] [csv_file] '
+              '[output_directory]')
@@ -15,8 +15,7 @@ If regression line isn't fitted on the scatterplot correctly, the logarithmic re
 
 
 
-from typing import ValuesView
-import data_importer
+import country_table
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy import stats
@@ -31,32 +30,18 @@ if __name__ == "__main__":
     var2 = input('Variable 2 (y-axis):')
 
     # Ask user input for either linear or logarithmic scale
-    scale_input = input('Enter `log` or `linear` for the scale: ', or 'linear')
+    scale_input = input('Enter `log` or `linear` for the scale: ') or 'linear'
 
-    # Select data from the Country Data File
-    with open('Countries Data File.txt', 'r+') as f:
-        lines = f.readlines()
-        lines_list = [line.rstrip() for line in lines]
-
-    # Select the line with each country's data
-    index_row = lines_list[0]
-    index_list = index_row.split(', ')
-    var1_index = 0
-    for count, element in enumerate(index_list):
-        if element == var1:
-            var1_index = count
-    var2_index = 0
-    for count, element in enumerate(index_list):
-        if element == var2:
-            var2_index = count
-
-    values = lines_list[1:]
-    var1_data = [float(line.split(',')[var1_index]) for line in values]
-    var2_data = [float(line.split(',')[var2_index]) for line in values]
+    # Select only the two columns from the country table
+    table = country_table.CountryTable(countries=countries_list)
+    values = table.select([var1, var2])
+    # Skip countries without a value for either variable
+    values = values[~np.isnan(values).any(axis=1)]
+    var1_data, var2_data = values.T.tolist()
 
     # Plot the points
     # If linear fit doesn't work; uncomment this section instead and comment the linear section
-    if scale_input is 'log':
+    if scale_input == 'log':
         # Logarithmic variables
         var1_data_log = [np.log10(i+1) for i in var1_data]
         var2_data_log = [np.log10(i+1) for i in var2_data]
@@ -67,9 +52,9 @@ if __name__ == "__main__":
         print(result_log.slope)
         print(regression_values_log)
 
-        title = str(index_list[var1_index] + ' vs ' + index_list[var2_index] + 'linearly for all countries')
-        xlabel = str(index_list[var1_index])
-        ylabel = str(index_list[var2_index])
+        title = str(var1 + ' vs ' + var2 + 'linearly for all countries')
+        xlabel = str(var1)
+        ylabel = str(var2)
         plt.scatter(var1_data, var2_data)
         plt.plot(x_values, regression_values_log, label='Regression', color='r')
         plt.title(title)
@@ -79,14 +64,14 @@ if __name__ == "__main__":
         plt.yscale('log')
         plt.show()
 
-    elif scale_input is 'linear':
+    elif scale_input == 'linear':
         # Linear variables 
         result = stats.linregress(var1_data, var2_data)
         print('The Pearson R is: ', result.rvalue)
         regression_values = [(result.intercept + result.slope*i) for i in var1_data]
-        title = str(index_list[var1_index] + ' vs ' + index_list[var2_index] + 'logarithmically for all countries')
-        xlabel = str(index_list[var1_index])
-        ylabel = str(index_list[var2_index])
+        title = str(var1 + ' vs ' + var2 + 'logarithmically for all countries')
+        xlabel = str(var1)
+        ylabel = str(var2)
         plt.scatter(var1_data, var2_data)
         plt.plot(var1_data, regression_values, label='Regression', color='r')
         plt.title(title)
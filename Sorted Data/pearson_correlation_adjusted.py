@@ -1,5 +1,4 @@
-from typing import ValuesView
-import data_importer
+import country_table
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy import stats
@@ -13,26 +12,12 @@ if __name__ == "__main__":
     var1 = input('Variable 1:')
     var2 = input('Variable 2:')
 
-    # Select data from the Country Data File
-    with open('Countries Data File.txt', 'r+') as f:
-        lines = f.readlines()
-        lines_list = [line.rstrip() for line in lines]
-
-    # Select the line with each country's data
-    index_row = lines_list[0]
-    index_list = index_row.split(', ')
-    var1_index = 0
-    for count, element in enumerate(index_list):
-        if element == var1:
-            var1_index = count
-    var2_index = 0
-    for count, element in enumerate(index_list):
-        if element == var2:
-            var2_index = count
-
-    values = lines_list[1:]
-    var1_data = [float(line.split(',')[var1_index]) for line in values]
-    var2_data = [float(line.split(',')[var2_index]) for line in values]
+    # Select only the two columns from the country table
+    table = country_table.CountryTable(countries=countries_list)
+    values = table.select([var1, var2])
+    # Skip countries without a value for either variable
+    values = values[~np.isnan(values).any(axis=1)]
+    var1_data, var2_data = values.T.tolist()
 
     # Compare the two variables
     result = stats.linregress(var1_data, var2_data)
@@ -51,9 +36,9 @@ if __name__ == "__main__":
     print(regression_values_log)
 
     # Plot the points
-    title = str(index_list[var1_index] + ' vs ' + index_list[var2_index] + ' for all countries')
-    xlabel = str(index_list[var1_index])
-    ylabel = str(index_list[var2_index])
+    title = str(var1 + ' vs ' + var2 + ' for all countries')
+    xlabel = str(var1)
+    ylabel = str(var2)
     plt.scatter(var1_data, var2_data)
     plt.plot(x_values, regression_values_log, label='Regression', color='r')
     plt.title(title)
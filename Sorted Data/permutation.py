@@ -0,0 +1,209 @@
+"""
+Permutation tests for comparing country subsets.
+
+The group labels of the raw per-country values are shuffled in batches: each
+batch is a (permutations, countries) matrix of shuffled values from a seeded
+numpy.random.Generator, reduced to one statistic per row, so 10^5
+permutations take a handful of Numpy operations. A test stops early once the
+p-value is resolved, i.e. once a confidence interval around the running
+estimate no longer contains any of the significance thresholds that matter,
+and the p-values of several pairwise tests are corrected for multiple
+comparisons.
+"""
+
+from itertools import combinations
+from typing import Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+from scipy import stats
+from bootstrap import CHUNK_ELEMENTS, Seed
+
+STATISTICS = ('mean', 'median')
+CORRECTIONS = ('holm', 'bonferroni', 'fdr_bh', 'none')
+# Upper bound on the number of shuffles per batch; early stopping is checked
+# after every batch.
+BATCH_PERMUTATIONS = 2 ** 13
+# Error rate of the confidence interval that decides on early stopping.
+RESOLUTION_LEVEL = 1e-3
+
+
+def _differences(shuffled: np.ndarray, size: int,
+                 statistic: str) -> np.ndarray:
+    """Returns the statistic of the first size columns minus that of the
+    other columns, for every row."""
+    if statistic == 'mean':
+        first = shuffled[:, :size].sum(axis=1)
+        total = shuffled.sum(axis=1)
+        return first / size - (total - first) / (shuffled.shape[1] - size)
+    return np.median(shuffled[:, :size], axis=1) - \
+        np.median(shuffled[:, size:], axis=1)
+
+
+def _resolved(extreme: int, permutations: int,
+              thresholds: Sequence[float]) -> bool:
+    """Returns whether the Clopper-Pearson interval of the p-value lies
+    entirely on one side of every threshold."""
+    lower = stats.beta.ppf(
+        RESOLUTION_LEVEL / 2, extreme, permutations - extreme + 1
+    ) if extreme > 0 else 0.0
+    upper = stats.beta.ppf(
+        1 - RESOLUTION_LEVEL / 2, extreme + 1, permutations - extreme
+    ) if extreme < permutations else 1.0
+    return all(t < lower or t > upper for t in thresholds)
+
+
+def permutation_test(a: Iterable[float], b: Iterable[float],
+                     statistic: str = 'mean', permutations: int = 100000,
+                     seed: Seed = None, thresholds: Sequence[float] = (0.05,),
+                     early_stop: bool = True) -> Tuple[float, float, int]:
+    """Two-sided permutation test for a difference in mean or median between
+    two groups.
+
+    Args:
+        a (Iterable[float]): The values of the first group.
+        b (Iterable[float]): The values of the second group.
+        statistic (str): 'mean' or 'median'.
+        permutations (int): The maximum number of label shuffles.
+        seed (Seed): The seed (or SeedSequence) of the random stream.
+        thresholds (Sequence[float]): The significance thresholds the
+        p-value is compared against, for early stopping.
+        early_stop (bool): Whether to stop once the p-value is resolved
+        with respect to all thresholds.
+
+    Returns:
+        Tuple[float, float, int]: The observed difference (a minus b), the
+        p-value and the number of shuffles used.
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f'Unknown statistic [{statistic}].')
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if len(a) == 0 or len(b) == 0:
+        return np.nan, np.nan, 0
+
+    pooled = np.concatenate((a, b))
+    observed = float(_differences(pooled[np.newaxis], len(a), statistic)[0])
+    # Shuffles that tie with the observed value up to rounding count as
+    # extreme too.
+    cutoff = abs(observed) * (1 - 1e-12)
+
+    generator = np.random.default_rng(seed)
+    batch = max(1, min(BATCH_PERMUTATIONS, CHUNK_ELEMENTS // len(pooled)))
+    extreme = 0
+    done = 0
+    while done < permutations:
+        size = min(batch, permutations - done)
+        shuffled = generator.permuted(
+            np.broadcast_to(pooled, (size, len(pooled))), axis=1
+        )
+        extreme += int(np.count_nonzero(
+            np.abs(_differences(shuffled, len(a), statistic)) >= cutoff
+        ))
+        done += size
+        if early_stop and _resolved(extreme, done, thresholds):
+            break
+
+    # The observed labelling counts as one of the permutations.
+    return observed, (extreme + 1) / (done + 1), done
+
+
+def adjust(p_values: Iterable[float], method: str = 'holm') -> np.ndarray:
+    """Corrects p-values for multiple comparisons.
+
+    Args:
+        p_values (Iterable[float]): The p-values of all tests.
+        method (str): 'holm' (Holm-Bonferroni), 'bonferroni', 'fdr_bh'
+        (Benjamini-Hochberg false discovery rate) or 'none'.
+
+    Returns:
+        np.ndarray: The adjusted p-values, in the original order.
+    """
+    p = np.asarray(p_values, dtype=np.float64)
+    m = len(p)
+    if method == 'none' or m == 0:
+        return p.copy()
+    if method == 'bonferroni':
+        return np.minimum(p * m, 1.0)
+
+    order = np.argsort(p)
+    adjusted = np.empty(m)
+    if method == 'holm':
+        steps = p[order] * (m - np.arange(m))
+        adjusted[order] = np.maximum.accumulate(steps)
+    elif method == 'fdr_bh':
+        steps = p[order] * m / np.arange(1, m + 1)
+        adjusted[order] = np.minimum.accumulate(steps[::-1])[::-1]
+    else:
+        raise ValueError(f'Unknown correction [{method}].')
+
+    return np.minimum(adjusted, 1.0)
+
+
+def _thresholds(alpha: float, m: int, method: str) -> List[float]:
+    """Returns the unadjusted p-value thresholds at which the correction of
+    m p-values can change a decision at level alpha."""
+    if method == 'none':
+        return [alpha]
+    if method == 'bonferroni':
+        return [alpha / m]
+    if method == 'holm':
+        return [alpha / k for k in range(1, m + 1)]
+    if method == 'fdr_bh':
+        return [alpha * k / m for k in range(1, m + 1)]
+    raise ValueError(f'Unknown correction [{method}].')
+
+
+def pairwise_tests(groups: Dict[str, Iterable[float]],
+                   statistic: str = 'mean', permutations: int = 100000,
+                   seed: Seed = None, alpha: float = 0.05,
+                   correction: str = 'holm', early_stop: bool = True
+                   ) -> List[Tuple[str, str, float, float, float, int]]:
+    """Runs a permutation test for every pair of groups and corrects the
+    p-values for the number of pairs.
+
+    Each pair gets its own random stream spawned from the seed. Early
+    stopping resolves every p-value against all thresholds the correction
+    can compare it with, for m pairs: alpha / m for bonferroni, alpha / k
+    for holm and alpha * k / m for fdr_bh, with k from 1 to m.
+
+    Args:
+        groups (Dict[str, Iterable[float]]): The values per group name.
+        statistic (str): 'mean' or 'median'.
+        permutations (int): The maximum number of shuffles per pair.
+        seed (Seed): The seed (or SeedSequence) of the random streams.
+        alpha (float): The family-wise significance level.
+        correction (str): The correction method, see adjust.
+        early_stop (bool): Whether tests may stop once resolved.
+
+    Returns:
+        List[Tuple[str, str, float, float, float, int]]: Per pair, the group
+        names, the observed difference, the p-value, the adjusted p-value
+        and the number of shuffles used.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+
+    pairs = list(combinations(groups, 2))
+    m = max(1, len(pairs))
+    thresholds = _thresholds(alpha, m, correction)
+    results = [
+        (first, second) + permutation_test(
+            groups[first], groups[second], statistic, permutations,
+            sequence, thresholds, early_stop
+        )
+        for (first, second), sequence in zip(pairs, seed.spawn(len(pairs)))
+    ]
+    adjusted = adjust([result[3] for result in results], correction)
+    return [
+        (first, second, observed, p, q, used)
+        for (first, second, observed, p, used), q in zip(results, adjusted)
+    ]
+
+
+def print_tests(results: List[Tuple[str, str, float, float, float, int]],
+                statistic: str = 'mean', correction: str = 'holm'):
+    """Prints the results of pairwise_tests as a table."""
+    print(f'Permutation tests, difference in {statistic}, '
+          f'p-values adjusted with {correction}:')
+    for first, second, observed, p, q, used in results:
+        print(f'{first} vs {second}: difference {observed:.6g}, '
+              f'p {p:.4g}, adjusted p {q:.4g} ({used} permutations)')
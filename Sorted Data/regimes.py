@@ -0,0 +1,103 @@
+"""
+Bucketing of countries into regime types by democracy index score.
+
+Scores of a year or range of years are loaded as one array aligned with a
+country list, and np.digitize assigns every country to a bin between
+configurable edges in a single call, so threshold sensitivity sweeps only
+need other edges. The buckets are arrays of country indices, ready to select
+the values of a (country, variable) matrix for the bootstrap.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from democracy_panel import DemocracyPanel, Years
+
+# Upper bounds (inclusive) of the regime types of the Economist Intelligence
+# Unit: a score above 80 is a full democracy, above 60 a flawed democracy and
+# above 40 a hybrid regime.
+REGIME_EDGES = (40.0, 60.0, 80.0)
+# Names of the bins, from the lowest scores to the highest.
+REGIME_LABELS = (
+    'Authoritarian Regime', 'Hybrid Regime', 'Flawed Democracy',
+    'Full Democracy'
+)
+
+
+def load_scores(countries: List[str], years: Optional[Years] = None
+                ) -> np.ndarray:
+    """Returns the democracy index scores of the given countries.
+
+    Args:
+        countries (List[str]): The country names.
+        years (Optional[Years]): The year, or inclusive (first, last) range
+        of years, of the democracy index panel (see democracy_panel.py) to
+        use, or None for the 2020 scores of democracy_index_2020.txt. That
+        file also scores Algeria, Iran, Lithuania and Ukraine, whose panel
+        rows end in 2019. Over a range, the mean score of each country is
+        used.
+
+    Returns:
+        np.ndarray: The score per country, NaN if a country has none.
+    """
+    if years is not None:
+        return DemocracyPanel().get_scores(countries, years)
+
+    scores = {}
+    with open('democracy_index_2020.txt') as file:
+        for line in file.read().splitlines():
+            country, score = line.split(', ')
+            scores[country] = score
+
+    values = np.full(len(countries), np.nan)
+    for i, country in enumerate(countries):
+        try:
+            values[i] = float(scores[country])
+        except (KeyError, ValueError):
+            pass
+    return values
+
+
+def unscored(countries: List[str], scores: np.ndarray) -> List[str]:
+    """Returns the countries that have no score in the loaded scores but do
+    have one in democracy_index_2020.txt, so they drop out of the buckets
+    only because of the chosen years."""
+    reference = load_scores(countries)
+    return [
+        country for i, country in enumerate(countries)
+        if np.isnan(scores[i]) and not np.isnan(reference[i])
+    ]
+
+
+def bucket(scores: np.ndarray, edges: Sequence[float] = REGIME_EDGES,
+           labels: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """Assigns every score to a bin. Bin i holds the scores above edge i - 1
+    up to and including edge i; the first and last bins are unbounded below
+    and above. Scores that are NaN are left out.
+
+    Args:
+        scores (np.ndarray): The score per country.
+        edges (Sequence[float]): The ascending bin edges.
+        labels (Optional[Sequence[str]]): One name per bin, from the lowest
+        scores to the highest. By default REGIME_LABELS for REGIME_EDGES,
+        and otherwise the score range of each bin.
+
+    Returns:
+        Dict[str, np.ndarray]: The country indices per bin name, ordered
+        from the highest scores to the lowest.
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    if labels is None:
+        if tuple(edges) == REGIME_EDGES:
+            labels = REGIME_LABELS
+        else:
+            bounds = ['-inf'] + [f'{e:g}' for e in edges] + ['inf']
+            labels = [f'({a}, {b}]' for a, b in zip(bounds[:-1], bounds[1:])]
+    if len(labels) != len(edges) + 1:
+        raise ValueError(f'Expected {len(edges) + 1} labels for the bins.')
+
+    scores = np.asarray(scores, dtype=np.float64)
+    known = np.flatnonzero(~np.isnan(scores))
+    bins = np.digitize(scores[known], edges, right=True)
+    return {
+        labels[i]: known[bins == i] for i in reversed(range(len(labels)))
+    }
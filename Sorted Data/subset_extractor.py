@@ -44,9 +44,9 @@ if __name__ == "__main__":
         country_dict = {}
         total_data = []
         for country in subset_countries:
-            data = np.array(data_importer.import_numerics_handle_none(
-                str(country + '/' + user_input + '.data'), 0.0
-            ))
+            data = data_importer.import_tail(
+                country, user_input, 7, 0.0
+            )
             country_dict[country] = data[-1]
             total_data.append(data[-1])
 
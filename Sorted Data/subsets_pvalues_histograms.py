@@ -12,9 +12,9 @@ The user is prompted to give a variable name and the size of the bootstrapped sa
 (approximatly between 1000-10.000 to create a smooth distribution).
 Next, country subsets are created based on the Total Democracy Index value, bootstrapped as many times as the user wishes
 and are used to test the spread of the different distributions. 
-Finally a Kolmogorov-Smirnov test is done to test the normality
-of the subsets, and the non-parametric Mann-Whitney U test is used to compare the subsets using the Scipy package for p=0.95, 
-with the results printed in the terminal. 
+Finally the raw country values of every pair of subsets are compared with a permutation test
+on the difference in means (or medians), with the p-values corrected for the number of
+comparisons (Holm-Bonferroni) and the results printed in the terminal.
 The final subset results are plotted in overlapping histograms together with their respective means.
 
 *Note*
@@ -27,6 +27,17 @@ To run this file run the following:
 python subsets_pvalues_histograms.py
 input the file name for the variable data
 input the number of bootstrap samples per subset (the default is 10000)
+input the number of worker processes to spread the resampling over (the default is 1)
+input y to run in streaming mode, which keeps memory constant for very large numbers of
+samples (the default is n)
+input a random seed to make the results reproducible (optional)
+input the maximum number of permutations per test (the default is 100000)
+input the test statistic, mean or median (the default is mean)
+input the ascending democracy index scores that separate the regime types, any number
+of them (the default is 40,60,80 for the four regime types)
+input the year of the democracy index scores in democracy_index.txt, or a range of years
+like 2015-2020 to use the mean score of each country (the default is 2020, from
+democracy_index_2020.txt)
 
 required files:
 democracy_index_2020.txt
@@ -36,10 +47,12 @@ data_imported.py
 """
 
 import re
-import data_importer
+import bootstrap
+import latest_index
+import permutation
+import regimes
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy import stats
 
 if __name__ == "__main__":
     # Import country names from the covid database countries.txt file
@@ -79,205 +92,104 @@ if __name__ == "__main__":
     f.close()
     """
 
-    # Import country names and data from the democracy index (DI) countries file
-    with open('democracy_index_2020.txt') as f:
-        democracy_index = f.read().splitlines()
-
-    # Create a dictionary with all countries' DI
-    democracy_index_dict = {}
-    for line in democracy_index:
-        temp = line.split(', ')
-        democracy_index_dict[temp[0]] = temp[1]
-
-    # Divide the countries in subsets by their democracy index and create for each subset
-    # a list and dictionary.
-    full_t = 90.00
-    full_b = 80.00
-    flaw_t = 70.00
-    flaw_b = 60.00
-    hybr_t = 50.00
-    hybr_b = 40.00
-    auth_t = 30.00
-    auth_m = 20.00
-    auth_b = 0.00
-
-    full_t_dict = {}
-    full_b_dict = {}
-    flaw_t_dict = {}
-    flaw_b_dict = {}
-    hybr_t_dict = {}
-    hybr_b_dict = {}
-    auth_t_dict = {}
-    auth_m_dict = {}
-    auth_b_dict = {}
-
-    full_t_list = []
-    full_b_list = []
-    flaw_t_list = []
-    flaw_b_list = []
-    hybr_t_list = []
-    hybr_b_list = []
-    auth_t_list = []
-    auth_m_list = []
-    auth_b_list = []
-
-    # Add data to each list according to the regime category scores.
-    for element in democracy_index_dict:
-        key = element
-        try:
-            value = float(democracy_index_dict[element])
-        except:
-            print(key, democracy_index_dict[key])
-            continue
-        if value > full_t:
-            full_t_dict[key] = value
-            full_t_list.append(value)
-        elif value > full_b:
-            full_b_dict[key] = value
-            full_b_list.append(value)
-        elif value > flaw_t:
-            flaw_t_dict[key] = value
-            flaw_t_list.append(value)
-        elif value > flaw_b:
-            flaw_b_dict[key] = value
-            flaw_b_list.append(value)
-        elif value > hybr_t:
-            hybr_t_dict[key] = value
-            hybr_t_list.append(value)
-        elif value > hybr_b:
-            hybr_b_dict[key] = value
-            hybr_b_list.append(value)
-        elif value > auth_t:
-            auth_t_dict[key] = value
-            auth_t_list.append(value)
-        elif value > auth_m:
-            auth_m_dict[key] = value
-            auth_m_list.append(value)
-        else:
-            auth_b_dict[key] = value
-            auth_b_list.append(value)
-
-    len_full_t = len(full_t_list)
-    len_full_b = len(full_b_list)
-    len_flaw_t = len(flaw_t_list)
-    len_flaw_b = len(flaw_b_list)
-    len_hybr_t = len(hybr_t_list)
-    len_hybr_b = len(hybr_b_list)
-    len_auth_t = len(auth_t_list)
-    len_auth_m = len(auth_m_list)
-    len_auth_b = len(auth_b_list)
-
-    # The following lines create dictionaries and lists of the different country subsets
-    full_democracies_dict = dict(list(full_t_dict.items()) + list(full_b_dict.items()))
-    flawed_democracies_dict = dict(list(flaw_t_dict.items()) + list(flaw_b_dict.items()))
-    hybrid_regimes_dict = dict(list(hybr_t_dict.items()) + list(hybr_b_dict.items()))
-    authoritarian_regimes_dict = dict(list(auth_t_dict.items()) + list(auth_m_dict.items()) + list(auth_b_dict.items()))
-
-    full_democracies_list = full_t_list + full_b_list
-    flawed_democracies_list = flaw_t_list + flaw_b_list
-    hybrid_regimes_list = hybr_t_list + hybr_b_list
-    authoritarian_regimes_list = auth_t_list + auth_m_list + auth_b_list
-
-    full_democracies_len = len(full_democracies_list)
-    flawed_democracies_len = len(flawed_democracies_list)
-    hybrid_regimes_len = len(hybrid_regimes_list)
-    authoritarian_regimes_len = len(authoritarian_regimes_list)
-
-    full_democracies = [i for i in full_democracies_dict]
-    flawed_democracies = [i for i in flawed_democracies_dict]
-    hybrid_regimes = [i for i in hybrid_regimes_dict]
-    authoritarian_regimes = [i for i in authoritarian_regimes_dict]
-    all_democracy_index_countries = [i for i in democracy_index_dict]
-        
     """ The next part performs bootstraps for the four main regime types, calculating normality, p-values
      and plotting the data in histograms. """
 
     # Prompt the user for the data variable and the number of samples
     user_input = input("Country Data File Name: ")
     bootstrap_samples = int(input('Number Of Bootstrap Samples: ') or '10000')    
-
-    # Returns data for a specified country and variable
-    def data_selector(country, user_input):
-        # Select the user-input data
-        data = np.array(data_importer.import_numerics_handle_none(
-            str(country + '/' + user_input + '.data'), 0.0
-        ))
-
-        # Get the first value larger than 0.0 or the minimal_value
-        for i in range(1, 8):
-            temp = data[-i]
-            if temp <= 0.0:
-                continue
-            elif temp > 0.0:
-                return temp
+    workers = int(input('Number Of Worker Processes: ') or '1')
+    streaming = input('Streaming Mode, constant memory (y/n, default n): ').lower() == 'y'
+    seed = input('Random Seed (optional): ')
+    seed = int(seed) if seed else None
+    permutations = int(input('Number Of Permutations (default 100000): ') or '100000')
+    statistic = input('Test Statistic (mean/median, default mean): ') or 'mean'
+    edges = input('Regime Bin Edges (ascending comma-separated scores, default 40,60,80): ')
+    edges = [float(i) for i in edges.split(',')] if edges else regimes.REGIME_EDGES
+    if any(a >= b for a, b in zip(edges[:-1], edges[1:])):
+        print('The regime bin edges must be ascending.')
+        exit(1)
+    year = input('Democracy Index Year, or range of years like 2015-2020 (default 2020): ')
+    year = tuple(int(i) for i in year.split('-')) if '-' in year else int(year) if year else None
+    # One independent random stream per subset and one for the tests, derived from the single seed.
+    seed_sequence = np.random.SeedSequence(seed)
+
+    # Latest values of all countries, recomputed only for changed data files.
+    index = latest_index.LatestIndex()
 
     # Set up orginial data and bootstrapping parameters and perform bootstrap resampling for each subset
-    def bootstrapper(data_list, subset_size, bootstrap_samples=bootstrap_samples):
-        # Filter out possible None values from the data_list
-        for count, i in enumerate(data_list):
-            if i is None:
-                data_list[count] = 0.0
-
-        resampled_data_list = []
-        for i in range(bootstrap_samples):
-            temp = np.random.choice(data_list, subset_size)
-            resampled_data_list.append(sum(temp)/len(temp))
-
-        resampled_data_mean = np.mean(resampled_data_list)
+    def bootstrapper(data_list, subset_size, seed, bootstrap_samples=bootstrap_samples):
+        resampled_data_list, resampled_data_mean, interval = bootstrap.bootstrap(
+            data_list, subset_size, bootstrap_samples, seed, workers=workers
+        )
+        print('95% confidence interval: ', interval)
 
         return resampled_data_list, resampled_data_mean
 
-    # Calculate bootstraps for each subset
-    subset1 = [data_selector(country, user_input) for country in full_democracies]
-    subset2 = [data_selector(country, user_input) for country in flawed_democracies]
-    subset3 = [data_selector(country, user_input) for country in hybrid_regimes]
-    subset4 = [data_selector(country, user_input) for country in authoritarian_regimes]
-
-    # Create bootstrapped subsets, which each resampling being equal in size of the original sample.
-    # The exception for this is subset4_data, since its distribution was less smooth than the other three.
-    # This is compensated by using a resampling size of 200.
-    subset1_data = bootstrapper(subset1, len(subset1))[0]
-    subset2_data = bootstrapper(subset2, len(subset2))[0]
-    subset3_data = bootstrapper(subset3, len(subset3))[0]
-    subset4_data = bootstrapper(subset4, 200)[0]
-
-    # Check normality with Kolmogorov-Smirnovtest
-    fullks = stats.kstest(subset1_data, subset2_data)
-    flawedks = stats.kstest(subset1_data, subset3_data)
-    hybridks = stats.kstest(subset1_data, subset4_data)
-    authks = stats.kstest(subset2_data, subset3_data)
-
-    # Calculating the statistical significance of the results with the non-parametric Mann-Whitney U test 
-    full_vs_flawed = stats.mannwhitneyu(subset1_data, subset2_data)
-    full_vs_hybrid = stats.mannwhitneyu(subset1_data, subset3_data)
-    full_vs_authoritarian = stats.mannwhitneyu(subset1_data, subset4_data)
-    flawed_vs_hybrid = stats.mannwhitneyu(subset2_data, subset3_data)
-    flawed_vs_authoritarian = stats.mannwhitneyu(subset2_data, subset4_data)
-    hybrid_vs_authoritarian = stats.mannwhitneyu(subset3_data, subset4_data)
-
-    print('P-value: 0.95')
-    print('full_vs_flawed: ', full_vs_flawed)
-    print('full_vs_hybrid: ', full_vs_hybrid)
-    print('full_vs_authoritarian', full_vs_authoritarian)
-    print('flawed_vs_hybrid: ', flawed_vs_hybrid)
-    print('flawed_vs_authoritarian: ', flawed_vs_authoritarian)
-    print('hybrid_vs_authoritarian: ', hybrid_vs_authoritarian)
-    print('fullks: ', fullks)
-    print('flawedks: ', flawedks)
-    print('hybridks', hybridks)
-    print('authks: ', authks)
-
-    # Plot the subset histograms of the data.
-    # The Authoritarian Regime subset data is less equally distributed
-    # compared to the other three subsets. This is compensated by using 
-    # less bins and a higher degree of opacity (alpha).
-    bins = 50
-    plt.title('Four subsets ' + str(user_input) + ' with ' + str(bootstrap_samples) + ' samples ')
+    # Streaming variant of the bootstrapper: the resample means are folded into running
+    # statistics and histograms, so memory stays constant for any number of samples.
+    def streaming_bootstrapper(data_list, subset_size, seed, bins):
+        summary = bootstrap.bootstrap_summary(
+            data_list, subset_size, bootstrap_samples, seed, workers, bins
+        )
+        print('Mean: ', summary.get_mean(), 'Standard deviation: ', np.sqrt(summary.get_variance()))
+        print('95% confidence interval: ', summary.percentile_interval())
+
+        return summary
+
+    # Divide the countries in the regime types by their democracy index score, as
+    # arrays of indices into countries_list, from the highest scores to the lowest.
+    scores = regimes.load_scores(countries_list, year)
+    missing = regimes.unscored(countries_list, scores) if year is not None else []
+    if missing:
+        print('Warning: no democracy index score in', year, 'for', ', '.join(missing))
+    buckets = regimes.bucket(scores, edges)
+
+    # Get the first value larger than 0.0 for every country from the latest values index.
+    # Countries without a value count as 0.0.
+    latest = index.get_snapshot([user_input])[0][:, 0]
+    latest = np.nan_to_num(latest, nan=0.0)
+
+    # Select the data of each subset
+    groups = {label: latest[indices] for label, indices in buckets.items()}
+    subset_seeds = seed_sequence.spawn(len(groups))
+    test_seed = seed_sequence.spawn(1)[0]
+
+    # Compare the raw country values of every pair of subsets with permutation tests,
+    # corrected for the number of comparisons.
+    tests = permutation.pairwise_tests(groups, statistic, permutations, test_seed)
+    permutation.print_tests(tests, statistic)
+
+    # The Authoritarian Regime subset data is less equally distributed compared to the
+    # other subsets. This is compensated by using a resampling size of 200, less bins
+    # and a higher degree of opacity (alpha).
+    def plot_settings(label, subset):
+        if label == 'Authoritarian Regime':
+            return 200, 15, 0.4
+        return len(subset), 50, 0.5
+
+    colors = {
+        'Full Democracy': 'b', 'Flawed Democracy': 'orange', 'Hybrid Regime': 'green',
+        'Authoritarian Regime': 'r'
+    }
+
+    plt.title('Subsets ' + str(user_input) + ' with ' + str(bootstrap_samples) + ' samples ')
     plt.xlabel(user_input)
     plt.ylabel('Frequency')
-    plt.hist(subset1_data, bins=bins, label='Full Democracy', color='b', alpha=0.5)
-    plt.hist(subset2_data, bins=bins, label='Flawed Democracy', color='orange', alpha=0.5)
-    plt.hist(subset3_data, bins=bins, label='Hybrid Regime', color='green', alpha=0.5)
-    plt.hist(subset4_data, bins=15, label='Authoritarian Regime', color='r', alpha=0.4)
+    for (label, subset), subset_seed in zip(groups.items(), subset_seeds):
+        if len(subset) == 0:
+            print('No countries in subset', label)
+            continue
+        subset_size, bins, alpha = plot_settings(label, subset)
+        if streaming:
+            summary = streaming_bootstrapper(subset, subset_size, subset_seed, bins)
+            counts, bin_edges = summary.get_histogram()
+            plt.hist(bin_edges[:-1], bins=bin_edges, weights=counts, label=label,
+                     color=colors.get(label), alpha=alpha)
+        else:
+            # Create bootstrapped subsets, which each resampling being equal in size of
+            # the original sample, except for the Authoritarian Regime subset.
+            subset_data = bootstrapper(subset, subset_size, subset_seed)[0]
+            plt.hist(subset_data, bins=bins, label=label, color=colors.get(label), alpha=alpha)
     plt.legend()
-    plt.show()
\ No newline at end of file
+    plt.show()
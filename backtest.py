@@ -0,0 +1,104 @@
+# School: University of Amsterdam
+# Course: Scientific Data Analysis 2021/2022
+# Programmed by: Team 10
+# Description: Backtests the index predictor of 2021DIPrediction.py for a
+#              grid of amountYears, endMult and order values over several
+#              holdout years: each holdout year is predicted from the years
+#              before it and compared with the true values. The EIU data is
+#              loaded once (see eiuData.py) and the grid points are spread
+#              over worker processes. The mean absolute error of every
+#              setting, holdout year and indicator is written to
+#              data/backtest.csv, next to the error of simply reusing the
+#              year before, and the best settings are printed.
+#              Run with: python backtest.py [workers]
+
+from itertools import product
+from multiprocessing import Pool
+import indexExtrapolation
+import eiuData
+import numpy as np
+import csv
+import sys
+
+# The grid of predictor settings.
+AMOUNT_YEARS = [2, 3, 4, 5, 6]
+END_MULTS = [0, 1, 2, 4, 6, 8]
+ORDERS = [1, 2, 3]
+# The years that are predicted from the years before them.
+HOLDOUT_YEARS = range(2015, 2021)
+
+# The (country, year, indicator) indexes, newest year first, with the years
+# and indicators of their axes, shared with the worker processes.
+indexes = None
+years = None
+indicators = None
+
+
+def share(sharedIndexes, sharedYears, sharedIndicators):
+    """Makes the parsed data available to a worker process."""
+    global indexes, years, indicators
+    indexes = sharedIndexes
+    years = sharedYears
+    indicators = sharedIndicators
+
+
+def backtest(setting):
+    """Predicts every holdout year with one setting.
+
+    Returns:
+        list: One row per holdout year and indicator: the setting, the year,
+        the indicator, the mean absolute error of the predictions and of
+        reusing the year before, and the number of indexes compared.
+    """
+    amountYears, endMult, order = setting
+    rows = []
+    for year in HOLDOUT_YEARS:
+        target = int(np.flatnonzero(years == year)[0])
+        if target + 1 + amountYears > len(years):
+            continue
+        truth = indexes[:, target]
+        previous = indexes[:, target + 1]
+        history = indexes[:, target + 1:target + 1 + amountYears]
+        predictions = np.clip(
+            indexExtrapolation.extrapolate(history, endMult, order), 0, 1)
+        valid = ~(np.isnan(truth) | np.isnan(previous) | np.isnan(predictions))
+        errors = np.where(valid, np.abs(predictions - truth), 0).sum(axis=0)
+        reuseErrors = np.where(valid, np.abs(previous - truth), 0).sum(axis=0)
+        counts = valid.sum(axis=0)
+        for i, indicator in enumerate(indicators):
+            rows.append([amountYears, endMult, order, year, indicator,
+                         errors[i] / max(counts[i], 1),
+                         reuseErrors[i] / max(counts[i], 1), counts[i]])
+    return rows
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    # An order-n fit needs more than n years.
+    settings = [setting for setting in product(AMOUNT_YEARS, END_MULTS, ORDERS)
+                if setting[0] > setting[2]]
+    data = eiuData.load()
+    parsed = (data.indexes, data.years, data.indicators.tolist())
+    if workers > 1:
+        with Pool(workers, share, parsed) as pool:
+            results = pool.map(backtest, settings)
+    else:
+        share(*parsed)
+        results = [backtest(setting) for setting in settings]
+
+    rows = [row for result in results for row in result]
+    with open("data/backtest.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["amountYears", "endMult", "order", "year",
+                         "indicator", "error", "reuseError", "count"])
+        writer.writerows(rows)
+
+    # Mean error of each setting over all holdout years and indicators.
+    print("amountYears endMult order error reuseError")
+    summary = [(setting, np.mean([row[5] for row in result]),
+                np.mean([row[6] for row in result]))
+               for setting, result in zip(settings, results)]
+    best = sorted(summary, key=lambda row: row[1])[:10]
+    for (amountYears, endMult, order), error, reuseError in best:
+        print(amountYears, endMult, order, error, reuseError)
+    print("Written to file [data/backtest.csv]")
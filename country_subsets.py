@@ -3,13 +3,13 @@
 """
 Scientific Data Analysis - 2021-22 - Project
 This file uses the input from subset_input.txt to create four different subset inputs, bootstrapped the samples,
-perform the Kolmogorov-Smirnov test and Mann-Whitney U test and plot the results.
+compare the subsets with permutation tests and plot the results.
 
 The user is prompted to give the variable name and the size of the bootstrapped samples.
 Next, country subsets are created based on the subset_input.txt file, bootstrapped as many times as the user wishes
-and are used to compare different COVID variables. Finally a Kolmogorov-Smirnov test is done to test the normality
-of the subsets, and the non-parametric Mann-Whitney U test is used to compare the subsets using the Scipy package for p=0.95, 
-with the results printed in the terminal. 
+and are used to compare different COVID variables. Finally the country values of every pair of subsets are compared
+with a permutation test on the difference in means (or medians), with the p-values corrected for the six comparisons
+(Holm-Bonferroni) and the results printed in the terminal.
 The final subset results are plotted in overlapping histograms together with their respective means.
 
 *Note*
@@ -18,6 +18,8 @@ To run this file run the following:
 python subsets_pvalues_histograms.py
 input the file name for the variable data
 input the number of bootstrap samples per subset (the default is 10000)
+input the maximum number of permutations per test (the default is 100000)
+input the test statistic, mean or median (the default is mean)
 
 required files:
 subset_input.txt
@@ -26,10 +28,11 @@ data_imported.py
 """
 
 import re
-import data_importer
+import bootstrap
+import latest_index
+import permutation
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy import stats
 from itertools import groupby
                                                                                                                                                                                                                                                                                                                                                                                                                  
 if __name__ == "__main__":
@@ -44,6 +47,8 @@ if __name__ == "__main__":
     # Prompt the user for the data variable and the number of samples
     user_input = input("Country Data File Name: ")
     bootstrap_samples = int(input('Number Of Bootstrap Samples: ') or '100000')    
+    permutations = int(input('Number Of Permutations (default 100000): ') or '100000')
+    statistic = input('Test Statistic (mean/median, default mean): ') or 'mean'
 
     split_indeces = []
     split_country_list = []
@@ -62,20 +67,13 @@ if __name__ == "__main__":
         'Subset 4': s4
     }
 
+    # Latest values of all countries, recomputed only for changed data files.
+    index = latest_index.LatestIndex()
+
     # Returns data for a specified country and variable
     def data_selector(country, user_input):
-        # Select the user-input data
-        data = np.array(data_importer.import_numerics_handle_none(
-            str(country + '/' + user_input + '.data'), 0.0
-        ))
-
-        # Get the first value larger than 0.0 or the minimal_value
-        for i in range(1, 8):
-            temp = data[-i]
-            if temp <= 0.0:
-                continue
-            elif temp > 0.0:
-                return temp
+        # Get the first value larger than 0.0 from the latest values index
+        return index.get_latest(country, user_input)
 
     # Set up orginial data and bootstrapping parameters and perform bootstrap resampling for each subset
     def bootstrapper(data_list, subset_size, bootstrap_samples=bootstrap_samples):
@@ -84,12 +82,10 @@ if __name__ == "__main__":
             if i is None:
                 data_list[count] = 0.0
 
-        resampled_data_list = []
-        for i in range(bootstrap_samples):
-            temp = np.random.choice(data_list, subset_size)
-            resampled_data_list.append(sum(temp)/len(temp))
-
-        resampled_data_mean = np.mean(resampled_data_list)
+        resampled_data_list, resampled_data_mean, interval = bootstrap.bootstrap(
+            data_list, subset_size, bootstrap_samples
+        )
+        print('95% confidence interval: ', interval)
 
         return resampled_data_list, resampled_data_mean
 
@@ -113,32 +109,16 @@ if __name__ == "__main__":
     s3_bootstrapped = bootstrapper(subset3_data, len(subset3))[0]
     s4_bootstrapped = bootstrapper(subset4_data, len(subset4))[0]
 
-    # Check normality with Kolmogorov-Smirnovtest
-    s1_vs_s2_n = stats.kstest(subset1_data, subset2_data)
-    s1_vs_s3_n = stats.kstest(subset1_data, subset3_data)
-    s1_vs_s4_n = stats.kstest(subset1_data, subset4_data)
-    s2_vs_s3_n = stats.kstest(subset2_data, subset3_data)
-
-    # Calculating the statistical significance of the results with the non-parametric Mann-Whitney U test 
-    s1_vs_s2 = stats.mannwhitneyu(subset1_data, subset2_data)
-    s1_vs_s3 = stats.mannwhitneyu(subset1_data, subset3_data)
-    s1_vs_s4 = stats.mannwhitneyu(subset1_data, subset4_data)
-    s2_vs_s3 = stats.mannwhitneyu(subset2_data, subset3_data)
-    s2_vs_s4 = stats.mannwhitneyu(subset2_data, subset4_data)
-    s3_vs_s4 = stats.mannwhitneyu(subset3_data, subset4_data)
-
-    print('P-value: 0.95')
-    print('Subset 1 vs 2: ', s1_vs_s2)
-    print('Subset 1 vs 3: ', s1_vs_s3)
-    print('Subset 1 vs 4', s1_vs_s4)
-    print('Subset 2 vs 3: ', s2_vs_s3)
-    print('Subset 2 va 4: ', s2_vs_s4)
-    print('Subset 3 vs 4: ', s3_vs_s4)
-    print('S1: ', s1_vs_s2_n)
-    print('S2: ', s1_vs_s3_n)
-    print('S3', s1_vs_s4_n)
-    print('S4: ', s2_vs_s3_n
-    )
+    # Compare the country values of every pair of subsets with permutation tests,
+    # corrected for the six comparisons.
+    groups = {
+        'Subset 1': subset1_data,
+        'Subset 2': subset2_data,
+        'Subset 3': subset3_data,
+        'Subset 4': subset4_data
+    }
+    tests = permutation.pairwise_tests(groups, statistic, permutations)
+    permutation.print_tests(tests, statistic)
 
     # Plot the subset histograms of the data.
     bins = 50
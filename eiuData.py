@@ -0,0 +1,91 @@
+# School: University of Amsterdam
+# Course: Scientific Data Analysis 2021/2022
+# Programmed by: Team 10
+# Description: Loads data/EIU_Data.csv as a float (country, year, indicator)
+#              tensor with NaN for missing values ("#N/A", ".." or empty),
+#              together with the country names and codes, the years and the
+#              indicators. The parsed data is cached in data/EIU_Data.npz,
+#              keyed on the SHA-256 hash of the CSV file, so the CSV is only
+#              parsed again when its contents change.
+
+from typing import NamedTuple
+import hashlib
+import tempfile
+import numpy as np
+import csv
+import os
+
+
+class EIUData(NamedTuple):
+    # The (country, year, indicator) indexes, newest year first.
+    indexes: np.ndarray
+    # The full country names, like "Bahamas, The".
+    countries: np.ndarray
+    # The three-letter country codes.
+    codes: np.ndarray
+    # The years of the year axis, newest first.
+    years: np.ndarray
+    # The indicators of the indicator axis.
+    indicators: np.ndarray
+
+    def year(self, year):
+        """Returns the (country, indicator) indexes of a year."""
+        return self.indexes[:, int(np.flatnonzero(self.years == year)[0])]
+
+    def country(self, code):
+        """Returns the (year, indicator) indexes of a country code."""
+        return self.indexes[int(np.flatnonzero(self.codes == code)[0])]
+
+
+def parse(filepath="data/EIU_Data.csv"):
+    """Parses the CSV file into an EIUData tuple."""
+    with open(filepath) as f:
+        rows = list(csv.reader(f))
+    # The first row holds codes like EIU20VA, the second the year of each
+    # column. Rows without a country code (like the last one) hold no data.
+    header, yearRow = rows[0], rows[1]
+    rows = np.array([row for row in rows[2:] if row[1].strip()])
+    first = header[2][:-2]
+    indicators = [code[-2:] for code in header[2:] if code.startswith(first)]
+    years = np.array(yearRow[2::len(indicators)]).astype(float).astype(int)
+
+    cells = rows[:, 2:2 + len(years) * len(indicators)]
+    values = np.full(cells.shape, np.nan)
+    for index, cell in np.ndenumerate(cells):
+        try:
+            values[index] = float(cell)
+        except ValueError:
+            pass
+    return EIUData(values.reshape(len(rows), len(years), len(indicators)),
+                   rows[:, 0], rows[:, 1], years, np.array(indicators))
+
+
+def load(filepath="data/EIU_Data.csv", cache="data/EIU_Data.npz"):
+    """Returns the EIU data as an EIUData tuple, from the cache if it was made
+    from a CSV file with the same contents."""
+    with open(filepath, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    try:
+        stored = np.load(cache)
+        if str(stored["digest"]) == digest:
+            return EIUData(*(stored[field] for field in EIUData._fields))
+    except (OSError, KeyError, ValueError):
+        pass
+
+    data = parse(filepath)
+    # A temporary file with a unique name, so scripts that load at the same
+    # time do not collide, removed if writing fails.
+    f = tempfile.NamedTemporaryFile(dir=os.path.dirname(cache) or ".",
+                                    suffix=".tmp", delete=False)
+    try:
+        with f:
+            np.savez(f, digest=digest, **data._asdict())
+        # Temporary files are private to their owner, the cache need not be.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(f.name, 0o666 & ~umask)
+        os.replace(f.name, cache)
+    except BaseException:
+        os.remove(f.name)
+        raise
+    return data
@@ -0,0 +1,87 @@
+# School: University of Amsterdam
+# Course: Scientific Data Analysis 2021/2022
+# Programmed by: Team 10
+# Description: Weighted least-squares extrapolation of the EIU indexes of all
+#              countries and indicators at once, used by 2021DIPrediction.py
+#              and predictionComparisons.py.
+#
+#              The predictors used to repeat every value int(year+1)**endMult
+#              times in a list, with the oldest year as year 0, and fit a
+#              UnivariateSpline of the given order through the positions in
+#              that list. Here every value is weighted instead: it covers
+#              as many consecutive positions on the x-axis as it had copies,
+#              and the least-squares sums over those positions are computed
+#              in closed form. The fits, and so the predictions, are the same
+#              as before, but cost the same for any endMult.
+
+import numpy as np
+from scipy.special import bernoulli, comb
+
+
+def _power_sums(n, total, degree):
+    """Returns the sums of (x / total)**m over x = 0 .. n-1, for m = 0 ..
+    degree, as an array with a leading axis for m (Faulhaber's formula)."""
+    bernoulliNumbers = bernoulli(degree)
+    ratio = n / total
+    sums = []
+    for m in range(degree + 1):
+        terms = [comb(m + 1, j) * bernoulliNumbers[j] * ratio ** (m + 1 - j)
+                 * total ** (1.0 - j) for j in range(m + 1)]
+        sums.append(sum(terms) / (m + 1))
+    return np.array(sums)
+
+
+def extrapolate(values, endMult=8, order=1, spacing="copies"):
+    """Predicts the next year of every country and indicator with a weighted
+    polynomial least-squares fit, for all of them in one batch.
+
+    Args:
+        values (np.ndarray): The (country, year, indicator) indexes, newest
+        year first, NaN where missing (see eiuData.py).
+        endMult (float): Year i, counting from 0 for the oldest, gets weight
+        (i+1)**endMult.
+        order (int): 1=Linear, 2=quadratic, 3=cubic fit.
+        spacing (str): "copies" lays the years out along the x-axis as the
+        old replicated lists did: each value covers as many positions as its
+        weight, and the prediction is at the position after the last one.
+        "years" puts every value at its year and predicts the next year.
+
+    Returns:
+        np.ndarray: The (country, indicator) predictions, NaN where fewer
+        than order+1 distinct positions have a value.
+    """
+    # Oldest year first, then (country, indicator, year).
+    values = np.moveaxis(np.asarray(values, dtype=np.float64)[:, ::-1], 1, -1)
+    valid = ~np.isnan(values)
+    y = np.where(valid, values, 0.0)
+    weights = np.where(valid, np.arange(1, values.shape[-1] + 1.0) ** endMult, 0.0)
+    degree = 2 * order
+
+    if spacing == "copies":
+        # Missing values take no positions, like the skipped list entries.
+        end = np.cumsum(weights, axis=-1)
+        total = end[..., -1:]
+        safeTotal = np.maximum(total, 1.0)
+        moments = _power_sums(end, safeTotal, degree) - \
+            _power_sums(end - weights, safeTotal, degree)
+        distinct = total[..., 0]
+    elif spacing == "years":
+        years = values.shape[-1]
+        x = np.arange(years) / years
+        powers = x ** np.arange(degree + 1)[:, np.newaxis]
+        moments = weights * powers[:, np.newaxis, np.newaxis]
+        distinct = valid.sum(axis=-1)
+    else:
+        raise ValueError("spacing must be \"copies\" or \"years\".")
+
+    # Normal equations of the fit in x scaled to [0, 1], where the
+    # prediction lies at x = 1.
+    sums = moments.sum(axis=-1)
+    targets = (moments[:order + 1] * y).sum(axis=-1)
+    powers = np.add.outer(np.arange(order + 1), np.arange(order + 1))
+    normal = np.moveaxis(sums[powers], (0, 1), (-2, -1))
+    targets = np.moveaxis(targets, 0, -1)
+    solvable = distinct > order
+    normal[~solvable] = np.eye(order + 1)
+    coefficients = np.linalg.solve(normal, targets[..., np.newaxis])[..., 0]
+    return np.where(solvable, coefficients.sum(axis=-1), np.nan)
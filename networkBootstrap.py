@@ -0,0 +1,135 @@
+# School: University of Amsterdam
+# Course: Scientific Data Analysis 2021/2022
+# Programmed by: Team 10
+# Description: Tests how stable the edges of the regression networks of
+#              regRegression.ipynb are. The countries are resampled with
+#              replacement many times, the network is refitted on every
+#              resample (see regressionNetwork.py), and for every edge
+#              between an EIU index and a corona column the confidence
+#              interval of its weight and the fraction of resamples in which
+#              it is selected (nonzero) are written to
+#              data/networkBootstrap_<method>.csv.
+#              The resamples are split into fixed blocks that each get their
+#              own random stream from the seed, so the same seed gives the
+#              same results for any number of worker processes.
+#              Run with:
+#              python networkBootstrap.py [method] [resamples] [workers] [seed]
+
+from multiprocessing import Pool
+import regressionNetwork
+import numpy as np
+import csv
+import sys
+
+# The default alphas of the notebook networks.
+ALPHAS = {"ridge": 1.0, "lasso": 0.001, "linear": 0.0}
+# Number of resamples per block, fitted in one batch.
+BLOCK_RESAMPLES = 250
+CONFIDENCE = 0.95
+
+# The (country, column) data shared with the worker processes.
+data = None
+
+
+def share(sharedData):
+    """Makes the data available to a worker process."""
+    global data
+    data = sharedData
+
+
+def resample_networks(task):
+    """Returns the (resample, column, column) networks of a single block."""
+    resamples, method, alpha, sequence = task
+    generator = np.random.default_rng(sequence)
+    weights = generator.multinomial(
+        len(data), np.full(len(data), 1 / len(data)), size=resamples)
+    return regressionNetwork.network(data, method, alpha, weights)
+
+
+def bootstrap(bootstrapData, method="ridge", alpha=None, resamples=2000,
+              workers=1, seed=None):
+    """Fits the network on resamples of the countries.
+
+    Args:
+        bootstrapData (np.ndarray): The (country, column) data, without NaN.
+        method (str): "ridge", "lasso" or "linear".
+        alpha (float): The penalty, by default the one of the notebook.
+        resamples (int): The number of resamples.
+        workers (int): The number of processes to spread the blocks over.
+        seed (int): The seed of the random streams, or None for fresh ones.
+
+    Returns:
+        np.ndarray: The (resample, column, column) adjacency matrices.
+    """
+    if alpha is None:
+        alpha = ALPHAS[method]
+    starts = range(0, resamples, BLOCK_RESAMPLES)
+    sequences = np.random.SeedSequence(seed).spawn(len(starts))
+    tasks = [(min(BLOCK_RESAMPLES, resamples - start), method, alpha, sequence)
+             for start, sequence in zip(starts, sequences)]
+    if workers > 1 and len(tasks) > 1:
+        with Pool(min(workers, len(tasks)), share, (bootstrapData,)) as pool:
+            parts = pool.map(resample_networks, tasks)
+    else:
+        share(bootstrapData)
+        parts = [resample_networks(task) for task in tasks]
+    return np.concatenate(parts)
+
+
+def edge_stability(networks, estimate, headers, confidence=CONFIDENCE,
+                   split=regressionNetwork.SPLIT):
+    """Summarizes the resampled weight of every edge between the two groups.
+
+    Args:
+        networks (np.ndarray): The (resample, column, column) networks.
+        estimate (np.ndarray): The network of the full data.
+        headers (list): The column headers.
+        confidence (float): The level of the percentile intervals.
+        split (int): The number of columns in the first group.
+
+    Returns:
+        list: One row per edge: both headers, the weight on the full data,
+        the mean weight, the lower and upper bound of the interval and the
+        fraction of resamples in which the edge is nonzero.
+    """
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(networks, [tail, 1 - tail], axis=0)
+    mean = networks.mean(axis=0)
+    selected = (networks != 0).mean(axis=0)
+    rows = []
+    for i in range(split):
+        for j in range(split, len(headers)):
+            rows.append([headers[i], headers[j], estimate[i, j], mean[i, j],
+                         low[i, j], high[i, j], selected[i, j]])
+    return rows
+
+
+if __name__ == "__main__":
+    method = sys.argv[1] if len(sys.argv) > 1 else "ridge"
+    resamples = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    if method not in ALPHAS:
+        print("Method must be one of: " + ", ".join(ALPHAS))
+        sys.exit(1)
+
+    fullData, headers = regressionNetwork.load()
+    # Removes rows which have non-float values, as the notebook does.
+    fullData = fullData[~np.isnan(fullData).any(axis=1)]
+    estimate = regressionNetwork.network(fullData, method, ALPHAS[method])
+    networks = bootstrap(fullData, method, resamples=resamples,
+                         workers=workers, seed=seed)
+    rows = edge_stability(networks, estimate, headers)
+
+    filepath = "data/networkBootstrap_" + method + ".csv"
+    with open(filepath, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["from", "to", "weight", "mean", "low", "high",
+                         "selected"])
+        writer.writerows(rows)
+
+    # The edges whose interval stays furthest from 0.
+    print("from to weight low high selected")
+    for row in sorted(rows, key=lambda row: -row[4])[:10]:
+        print(row[0], row[1], row[2], row[4], row[5], row[6])
+    print("Written to file [" + filepath + "]")
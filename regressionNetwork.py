@@ -0,0 +1,251 @@
+# School: University of Amsterdam
+# Course: Scientific Data Analysis 2021/2022
+# Programmed by: Team 10
+# Description: Builds the Ridge, Lasso and linear regression networks of
+#              regRegression.ipynb. Every column is regressed on all other
+#              columns, and the absolute coefficients become the edge weights
+#              of a symmetric adjacency matrix.
+#
+#              The notebook fitted one sklearn model per column. Here all of
+#              those leave-one-out fits come from the centered Gram matrix of
+#              the data: the Ridge coefficients of every column follow from a
+#              single inverse of the penalized Gram matrix, and the Lasso
+#              coefficients of all columns are found together by coordinate
+#              descent along a path of decreasing alphas, finished with an
+#              exact solve. Leading axes of the Gram matrices are batches
+#              (like resamples), fitted in one go.
+
+import eiuData
+import numpy as np
+import csv
+
+# The columns of the notebook data.
+HEADERS = ["VA", "PV", "GE", "RQ", "RL", "CC", "Tests", "Deaths", "Cases",
+           "Vaccinated", "Fully Vaxed"]
+# The first 6 columns of the notebook data are the EIU indexes, the rest are
+# the corona columns. Edges within either group are left out.
+SPLIT = 6
+METHODS = ("ridge", "lasso", "linear")
+
+
+def load(filepath="data/Merged.csv"):
+    """Reads the notebook data: the 2020 EIU indexes and the corona data per
+    inhabitant of every country of Merged.csv.
+
+    The EIU indexes are taken from EIU_Data.csv (see eiuData.py), as the
+    columns of Merged.csv are shifted for countries with a comma in their
+    name. Merged.csv lists the countries in the same order as EIU_Data.csv,
+    but without some of them.
+
+    Returns:
+        tuple: The (country, column) data, NaN where a value is missing, and
+        the column headers.
+    """
+    with open(filepath) as f:
+        rows = list(csv.reader(f))[1:]
+    eiu = eiuData.load()
+    eiuCountries = [country.split(",")[0] for country in eiu.countries]
+    indexes2020 = eiu.year(2020)
+    data = []
+    i = 0
+    for row in rows:
+        while eiuCountries[i] != row[0].strip():
+            i += 1
+        corona = []
+        for x in row[7:]:
+            try:
+                corona.append(float(x))
+            except ValueError:
+                corona.append(np.nan)
+        # Divides the corona data by the population of the country.
+        data.append(np.concatenate((indexes2020[i],
+                                    np.array(corona[:-1]) / corona[-1])))
+        i += 1
+    return np.array(data), list(HEADERS)
+
+
+def gram(data, weights=None):
+    """Returns the centered Gram matrices of the data and the sample counts.
+
+    Args:
+        data (np.ndarray): The (sample, column) data.
+        weights (np.ndarray): Optional (..., sample) counts of every sample,
+        like the number of times it was drawn in a resample.
+
+    Returns:
+        tuple: The (..., column, column) Gram matrices X^T X of the centered
+        columns, and the (...) sample counts.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if weights is None:
+        centered = data - data.mean(axis=0)
+        return centered.T @ centered, len(data)
+    weights = np.asarray(weights, dtype=np.float64)
+    samples = weights.sum(axis=-1)
+    means = weights @ data / samples[..., np.newaxis]
+    products = np.einsum("...n,ni,nj->...ij", weights, data, data)
+    return products - samples[..., np.newaxis, np.newaxis] * \
+        means[..., :, np.newaxis] * means[..., np.newaxis, :], samples
+
+
+def ridge_coefficients(gramMatrix, alpha=1.0):
+    """Returns the Ridge coefficients of every column regressed on the others.
+
+    The inverse P of the penalized Gram matrix holds all of them: by block
+    inversion, the coefficients of column x are -P[x, j] / P[x, x].
+
+    Args:
+        gramMatrix (np.ndarray): The (..., column, column) Gram matrices.
+        alpha (float): The Ridge penalty, as in sklearn's Ridge. 0 gives the
+        ordinary least-squares fits of LinearRegression.
+
+    Returns:
+        np.ndarray: The (..., target, column) coefficients, 0 on the diagonal.
+    """
+    size = gramMatrix.shape[-1]
+    inverse = np.linalg.inv(gramMatrix + alpha * np.eye(size))
+    diagonal = np.diagonal(inverse, axis1=-2, axis2=-1)
+    coefficients = -inverse / diagonal[..., :, np.newaxis]
+    coefficients[..., np.arange(size), np.arange(size)] = 0
+    return coefficients
+
+
+def _polish(gramMatrix, coefficients, threshold):
+    """Solves the Lasso conditions exactly on the nonzero coefficients of the
+    coordinate descent, keeping their signs.
+
+    Returns:
+        tuple: The polished (..., target, column) coefficients, and the
+        (..., target) mask of fits whose polished coefficients keep their
+        signs and leave every other column below the threshold.
+    """
+    size = gramMatrix.shape[-1]
+    signs = np.sign(coefficients)
+    active = signs != 0
+    both = active[..., :, np.newaxis] & active[..., np.newaxis, :]
+    # One system per target: the Gram matrix of its active columns, with the
+    # identity for the others.
+    systems = np.where(both, gramMatrix[..., np.newaxis, :, :], 0) + \
+        np.where(active, 0, 1)[..., np.newaxis] * np.eye(size)
+    threshold = threshold[..., np.newaxis, np.newaxis]
+    targets = np.where(active, gramMatrix - threshold * signs, 0)
+    try:
+        polished = np.linalg.solve(systems, targets[..., np.newaxis])[..., 0]
+    except np.linalg.LinAlgError:
+        return coefficients, np.zeros(coefficients.shape[:-1], dtype=bool)
+    rho = gramMatrix - polished @ gramMatrix
+    rho[..., np.arange(size), np.arange(size)] = 0
+    inactiveFine = active | (np.abs(rho) <= threshold * (1 + 1e-9))
+    activeFine = ~active | (np.sign(polished) == signs)
+    return polished, (inactiveFine & activeFine).all(axis=-1)
+
+
+def lasso_coefficients(gramMatrix, samples, alpha=0.001, steps=5, sweeps=10,
+                       maxIter=1000):
+    """Returns the Lasso coefficients of every column regressed on the others.
+
+    Minimizes ||y - Xw||^2 / (2 * samples) + alpha * ||w||_1 for all columns
+    at once, as sklearn's Lasso does. Cyclic coordinate descent on the Gram
+    matrix, warm-started along a path of steps alphas from the smallest alpha
+    that leaves every coefficient 0 down to alpha, finds which coefficients
+    are nonzero and their signs. The coefficients are then solved exactly from
+    those, which the scale differences of the columns make much faster than
+    descending all the way.
+
+    Args:
+        gramMatrix (np.ndarray): The (..., column, column) Gram matrices.
+        samples (np.ndarray): The (...) sample counts of the Gram matrices.
+        alpha (float): The Lasso penalty, as in sklearn's Lasso.
+        steps (int): The number of alphas of the path.
+        sweeps (int): The number of descent sweeps between exact solves.
+        maxIter (int): The maximum number of descent sweeps per alpha.
+
+    Returns:
+        np.ndarray: The (..., target, column) coefficients, 0 on the diagonal.
+    """
+    size = gramMatrix.shape[-1]
+    samples = np.asarray(samples, dtype=np.float64)
+    diagonal = np.diagonal(gramMatrix, axis1=-2, axis2=-1)
+    # Constant columns (possible in resamples) keep coefficient 0.
+    scale = np.where(diagonal > 0, 1 / np.where(diagonal > 0, diagonal, 1), 0)
+    offDiagonal = np.abs(gramMatrix - diagonal[..., np.newaxis] * np.eye(size))
+    alphaMax = max(float(
+        (offDiagonal / samples[..., np.newaxis, np.newaxis]).max()), alpha)
+    path = np.geomspace(alphaMax, alpha, steps) if steps > 1 else [alpha]
+
+    coefficients = np.zeros(gramMatrix.shape)
+    for pathAlpha in path:
+        threshold = samples * pathAlpha
+        cutoff = threshold[..., np.newaxis]
+        done = np.zeros(gramMatrix.shape[:-1], dtype=bool)
+        for sweep in range(maxIter):
+            for j in range(size):
+                old = coefficients[..., :, j]
+                # The correlation of column j with the residual of every
+                # target, without the part of column j itself.
+                rho = gramMatrix[..., j, :] - \
+                    (coefficients @ gramMatrix[..., :, j:j + 1])[..., 0] + \
+                    old * diagonal[..., j, np.newaxis]
+                new = np.sign(rho) * np.maximum(np.abs(rho) - cutoff, 0) * \
+                    scale[..., j, np.newaxis]
+                new[..., j] = 0
+                coefficients[..., :, j] = np.where(done, old, new)
+            if (sweep + 1) % sweeps == 0:
+                polished, accepted = _polish(gramMatrix, coefficients, threshold)
+                accepted &= ~done
+                coefficients[accepted] = polished[accepted]
+                done |= accepted
+                if done.all():
+                    break
+    return coefficients
+
+
+def adjacency(coefficients, split=SPLIT):
+    """Returns the symmetric adjacency matrices of the notebook networks.
+
+    Edge (x, j) with x < j is the absolute coefficient of column j in the fit
+    of column x, mirrored below the diagonal. Edges between two of the first
+    split columns, or two of the others, are 0, and the diagonal is 1.
+
+    Args:
+        coefficients (np.ndarray): The (..., target, column) coefficients.
+        split (int): The number of columns in the first group.
+
+    Returns:
+        np.ndarray: The (..., column, column) adjacency matrices.
+    """
+    size = coefficients.shape[-1]
+    upper = np.triu(np.abs(coefficients), 1)
+    matrix = upper + np.swapaxes(upper, -1, -2)
+    group = np.arange(size) < split
+    matrix[..., group[:, np.newaxis] == group[np.newaxis, :]] = 0
+    matrix[..., np.arange(size), np.arange(size)] = 1
+    return matrix
+
+
+def network(data, method="ridge", alpha=None, weights=None, split=SPLIT):
+    """Returns the adjacency matrix of a regression network of the data.
+
+    Args:
+        data (np.ndarray): The (sample, column) data, without NaN.
+        method (str): "ridge", "lasso" or "linear".
+        alpha (float): The penalty. By default the notebook's 1 for Ridge and
+        0.001 for Lasso.
+        weights (np.ndarray): Optional (..., sample) counts of every sample,
+        to build a network per resample at once.
+        split (int): The number of columns in the first group.
+
+    Returns:
+        np.ndarray: The (..., column, column) adjacency matrices.
+    """
+    gramMatrix, samples = gram(data, weights)
+    if method == "ridge":
+        coefficients = ridge_coefficients(gramMatrix, 1.0 if alpha is None else alpha)
+    elif method == "lasso":
+        coefficients = lasso_coefficients(gramMatrix, samples,
+                                          0.001 if alpha is None else alpha)
+    elif method == "linear":
+        coefficients = ridge_coefficients(gramMatrix, 0.0)
+    else:
+        raise ValueError("method must be one of " + ", ".join(METHODS) + ".")
+    return adjacency(coefficients, split)